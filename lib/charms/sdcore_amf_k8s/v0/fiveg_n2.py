@@ -46,10 +46,16 @@ class DummyFivegN2Requires(CharmBase):
 
     def _on_n2_information_available(self, event: N2InformationAvailableEvent):
         amf_ip_address = event.amf_ip_address
+        amf_ip_addresses = event.amf_ip_addresses
         amf_hostname = event.amf_hostname
         amf_port = event.amf_port
         <do something with the amf IP, hostname and port>
 
+    def _reconcile(self):
+        # Validated once, then served from cache while the relation data is unchanged.
+        if n2_information := self.n2_requirer.n2_information:
+            <do something with n2_information.amf_hostname and n2_information.amf_port>
+
 
 if __name__ == "__main__":
     main(DummyFivegN2Requires)
@@ -96,13 +102,15 @@ if __name__ == "__main__":
 """
 
 import logging
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from ipaddress import ip_address
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from interface_tester.schema_base import DataBagSchema
 from ops.charm import CharmBase, CharmEvents, RelationChangedEvent
 from ops.framework import EventBase, EventSource, Handle, Object
 from ops.model import Relation
-from pydantic import BaseModel, Field, IPvAnyAddress, ValidationError
+from pydantic import BaseModel, Field, IPvAnyAddress, ValidationError, field_validator
 
 # The unique Charmhub library identifier, never change it
 LIBID = "396917943b9b4b6989166b77c97a9fb8"
@@ -112,7 +120,7 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 4
+LIBPATCH = 7
 
 logger = logging.getLogger(__name__)
 """Schemas definition for the provider and requirer sides of the `fiveg_n2` interface.
@@ -125,7 +133,8 @@ Examples:
         app: {
             "amf_ip_address": "192.168.70.132"
             "amf_hostname": "amf",
-            "amf_port": 38412
+            "amf_port": 38412,
+            "amf_ip_addresses": "192.168.70.132,192.168.80.132"  # optional
         }
     RequirerSchema:
         unit: <empty>
@@ -143,6 +152,20 @@ class ProviderAppData(BaseModel):
         description="Hostname to reach the AMF's N2 interface.", examples=["amf"]
     )
     amf_port: int = Field(description="Port to reach the AMF's N2 interface.", examples=[38412])
+    amf_ip_addresses: Optional[str] = Field(
+        default=None,
+        description="Comma-separated IP addresses of the AMF's multi-homed N2 interface.",
+        examples=["192.168.70.132,192.168.80.132"],
+    )
+
+    @field_validator("amf_ip_addresses")
+    @classmethod
+    def validate_amf_ip_addresses(cls, value: Optional[str]) -> Optional[str]:
+        """Validate that every address of the multi-homed N2 interface is an IP address."""
+        if value is not None:
+            for address in value.split(","):
+                ip_address(address)
+        return value
 
 
 class ProviderSchema(DataBagSchema):
@@ -168,15 +191,33 @@ def data_is_valid(data: Dict[str, Any]) -> bool:
         return False
 
 
+@dataclass(frozen=True)
+class N2Information:
+    """Validated N2 information published by the AMF."""
+
+    amf_ip_address: str
+    amf_hostname: str
+    amf_port: int
+    amf_ip_addresses: Tuple[str, ...]
+
+
 class N2InformationAvailableEvent(EventBase):
     """Charm event emitted when N2 information is available. It carries the AMF hostname."""
 
-    def __init__(self, handle: Handle, amf_ip_address: str, amf_hostname: str, amf_port: int):
+    def __init__(
+        self,
+        handle: Handle,
+        amf_ip_address: str,
+        amf_hostname: str,
+        amf_port: int,
+        amf_ip_addresses: Optional[List[str]] = None,
+    ):
         """Init."""
         super().__init__(handle)
         self.amf_ip_address = amf_ip_address
         self.amf_hostname = amf_hostname
         self.amf_port = amf_port
+        self.amf_ip_addresses = amf_ip_addresses or [amf_ip_address]
 
     def snapshot(self) -> dict:
         """Return snapshot."""
@@ -184,6 +225,7 @@ class N2InformationAvailableEvent(EventBase):
             "amf_ip_address": self.amf_ip_address,
             "amf_hostname": self.amf_hostname,
             "amf_port": self.amf_port,
+            "amf_ip_addresses": self.amf_ip_addresses,
         }
 
     def restore(self, snapshot: dict) -> None:
@@ -191,6 +233,7 @@ class N2InformationAvailableEvent(EventBase):
         self.amf_ip_address = snapshot["amf_ip_address"]
         self.amf_hostname = snapshot["amf_hostname"]
         self.amf_port = snapshot["amf_port"]
+        self.amf_ip_addresses = snapshot.get("amf_ip_addresses", [self.amf_ip_address])
 
 
 class N2RequirerCharmEvents(CharmEvents):
@@ -209,6 +252,9 @@ class N2Requires(Object):
         super().__init__(charm, relation_name)
         self.charm = charm
         self.relation_name = relation_name
+        self._n2_information_cache: Dict[
+            int, Tuple[FrozenSet[Tuple[str, str]], Optional[N2Information]]
+        ] = {}
         self.framework.observe(charm.on[relation_name].relation_changed, self._on_relation_changed)
 
     def _on_relation_changed(self, event: RelationChangedEvent) -> None:
@@ -220,13 +266,26 @@ class N2Requires(Object):
         Returns:
             None
         """
-        if remote_app_relation_data := self._get_remote_app_relation_data(event.relation):
+        if n2_information := self._get_n2_information(event.relation):
             self.on.n2_information_available.emit(
-                amf_ip_address=remote_app_relation_data["amf_ip_address"],
-                amf_hostname=remote_app_relation_data["amf_hostname"],
-                amf_port=remote_app_relation_data["amf_port"],
+                amf_ip_address=n2_information.amf_ip_address,
+                amf_hostname=n2_information.amf_hostname,
+                amf_port=str(n2_information.amf_port),
+                amf_ip_addresses=list(n2_information.amf_ip_addresses),
             )
 
+    @property
+    def n2_information(self) -> Optional[N2Information]:
+        """Return the N2 information published by the AMF.
+
+        The relation data is validated once and the result is reused for as long as
+        the relation data is unchanged.
+
+        Returns:
+            N2Information: N2 information, or None if it is missing or invalid.
+        """
+        return self._get_n2_information()
+
     @property
     def amf_ip_address(self) -> Optional[str]:
         """Return AMF IP address.
@@ -234,10 +293,22 @@ class N2Requires(Object):
         Returns:
             str: AMF IP address.
         """
-        if remote_app_relation_data := self._get_remote_app_relation_data():
-            return remote_app_relation_data.get("amf_ip_address")
+        if n2_information := self.n2_information:
+            return n2_information.amf_ip_address
         return None
 
+    @property
+    def amf_ip_addresses(self) -> List[str]:
+        """Return every IP address of the AMF's multi-homed N2 interface.
+
+        Returns:
+            list: AMF IP addresses, or only the AMF IP address if the provider
+                does not publish several.
+        """
+        if n2_information := self.n2_information:
+            return list(n2_information.amf_ip_addresses)
+        return []
+
     @property
     def amf_hostname(self) -> Optional[str]:
         """Return AMF hostname.
@@ -245,8 +316,8 @@ class N2Requires(Object):
         Returns:
             str: AMF hostname.
         """
-        if remote_app_relation_data := self._get_remote_app_relation_data():
-            return remote_app_relation_data.get("amf_hostname")
+        if n2_information := self.n2_information:
+            return n2_information.amf_hostname
         return None
 
     @property
@@ -256,20 +327,18 @@ class N2Requires(Object):
         Returns:
             int: AMF port.
         """
-        if remote_app_relation_data := self._get_remote_app_relation_data():
-            return int(remote_app_relation_data.get("amf_port"))  # type: ignore[arg-type]
+        if n2_information := self.n2_information:
+            return n2_information.amf_port
         return None
 
-    def _get_remote_app_relation_data(
-        self, relation: Optional[Relation] = None
-    ) -> Optional[Dict[str, str]]:
-        """Get relation data for the remote application.
+    def _get_n2_information(self, relation: Optional[Relation] = None) -> Optional[N2Information]:
+        """Get the validated N2 information of the remote application.
 
         Args:
             relation: Juju relation object (optional).
 
         Returns:
-            Dict: Relation data for the remote application
+            N2Information: N2 information of the remote application
             or None if the relation data is invalid.
         """
         relation = relation or self.model.get_relation(self.relation_name)
@@ -280,10 +349,13 @@ class N2Requires(Object):
             logger.warning("No remote application in relation: %s", self.relation_name)
             return None
         remote_app_relation_data = dict(relation.data[relation.app])
-        if not data_is_valid(remote_app_relation_data):
-            logger.error("Invalid relation data: %s", remote_app_relation_data)
-            return None
-        return remote_app_relation_data
+        cache_key = frozenset(remote_app_relation_data.items())
+        cached = self._n2_information_cache.get(relation.id)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+        n2_information = _parse_n2_information(remote_app_relation_data)
+        self._n2_information_cache[relation.id] = (cache_key, n2_information)
+        return n2_information
 
 
 class N2Provides(Object):
@@ -295,13 +367,23 @@ class N2Provides(Object):
         self.relation_name = relation_name
         self.charm = charm
 
-    def set_n2_information(self, amf_ip_address: str, amf_hostname: str, amf_port: int) -> None:
+    def set_n2_information(
+        self,
+        amf_ip_address: str,
+        amf_hostname: str,
+        amf_port: int,
+        amf_ip_addresses: Optional[List[str]] = None,
+    ) -> None:
         """Set the hostname and the ngapp port in the application relation data.
 
+        Only the keys whose value differs are written, since every write triggers
+        a `relation-changed` hook on the remote application.
+
         Args:
             amf_ip_address (str): AMF IP address.
             amf_hostname (str): AMF hostname.
             amf_port (int): AMF NGAPP port.
+            amf_ip_addresses (list): Every IP address of a multi-homed N2 interface.
 
         Returns:
             None
@@ -311,15 +393,54 @@ class N2Provides(Object):
         relations = self.model.relations[self.relation_name]
         if not relations:
             raise RuntimeError(f"Relation {self.relation_name} not created yet.")
-        if not data_is_valid(
-            {"amf_ip_address": amf_ip_address, "amf_hostname": amf_hostname, "amf_port": amf_port}
-        ):
+        data: Dict[str, Any] = {
+            "amf_ip_address": amf_ip_address,
+            "amf_hostname": amf_hostname,
+            "amf_port": amf_port,
+        }
+        if amf_ip_addresses:
+            data["amf_ip_addresses"] = ",".join(amf_ip_addresses)
+        if not data_is_valid(data):
             raise ValueError("Invalid relation data")
+        relation_data = {
+            "amf_ip_address": amf_ip_address,
+            "amf_hostname": amf_hostname,
+            "amf_port": str(amf_port),
+            # An empty value removes the key from the relation data.
+            "amf_ip_addresses": data.get("amf_ip_addresses", ""),
+        }
         for relation in relations:
-            relation.data[self.charm.app].update(
-                {
-                    "amf_ip_address": amf_ip_address,
-                    "amf_hostname": amf_hostname,
-                    "amf_port": str(amf_port),
-                }
-            )
+            app_data = relation.data[self.charm.app]
+            if changes := {
+                key: value
+                for key, value in relation_data.items()
+                if app_data.get(key, "") != value
+            }:
+                app_data.update(changes)
+
+
+def _parse_n2_information(remote_app_relation_data: Dict[str, str]) -> Optional[N2Information]:
+    """Validate the provider app data and return it as N2 information.
+
+    Args:
+        remote_app_relation_data (dict): Provider app data.
+
+    Returns:
+        N2Information: N2 information, or None if the data is invalid.
+    """
+    try:
+        provider_app_data = ProviderAppData(**remote_app_relation_data)  # type: ignore[arg-type]
+    except ValidationError as e:
+        logger.error("Invalid relation data: %s", e)
+        return None
+    amf_ip_address = remote_app_relation_data["amf_ip_address"]
+    if amf_ip_addresses := remote_app_relation_data.get("amf_ip_addresses"):
+        all_amf_ip_addresses = tuple(amf_ip_addresses.split(","))
+    else:
+        all_amf_ip_addresses = (amf_ip_address,)
+    return N2Information(
+        amf_ip_address=amf_ip_address,
+        amf_hostname=provider_app_data.amf_hostname,
+        amf_port=provider_app_data.amf_port,
+        amf_ip_addresses=all_amf_ip_addresses,
+    )
@@ -4,12 +4,23 @@
 
 """Charmed operator for the SD-Core AMF service for K8s."""
 
+import hashlib
+import json
 import logging
-from ipaddress import IPv4Address
-from subprocess import check_output
-from typing import List, Optional, cast
+import math
+import os
+import re
+import sys
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from functools import cache
+from ipaddress import IPv4Address, ip_address
+from subprocess import DEVNULL, Popen, check_output
+from typing import Any, Callable, Dict, List, Mapping, Optional, cast
 
 import ops
+from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
 from charms.loki_k8s.v1.loki_push_api import LogForwarder
 from charms.prometheus_k8s.v0.prometheus_scrape import (
     MetricsEndpointProvider,
@@ -23,9 +34,13 @@ from charms.tls_certificates_interface.v4.tls_certificates import (
     Certificate,
     CertificateRequestAttributes,
     PrivateKey,
+    TLSCertificatesError,
     TLSCertificatesRequiresV4,
 )
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from lightkube.core.exceptions import ApiError
+from lightkube.models.core_v1 import ResourceRequirements
+from lightkube.utils.quantity import parse_quantity
 from ops import (
     ActiveStatus,
     BlockedStatus,
@@ -36,14 +51,28 @@ from ops import (
     main,
 )
 from ops.charm import (
+    ActionEvent,
     CharmBase,
+    LeaderElectedEvent,
+    PebbleCustomNoticeEvent,
     RelationBrokenEvent,
     RelationJoinedEvent,
     RemoveEvent,
+    UpgradeCharmEvent,
+)
+from ops.framework import EventBase, StoredState
+from ops.pebble import (
+    APIError,
+    Check,
+    CheckDict,
+    FileInfo,
+    Layer,
+    LayerDict,
 )
-from ops.framework import EventBase
-from ops.pebble import Layer
 
+from config_diff import ConfigChange, classify_config_change
+from hook_snapshot import HookSnapshot
+from k8s_compute_resources import K8sComputeResources
 from k8s_service import K8sService
 
 logger = logging.getLogger(__name__)
@@ -56,6 +85,12 @@ CONFIG_DIR_PATH = "/free5gc/config"
 CONFIG_FILE_NAME = "amfcfg.conf"
 CONFIG_TEMPLATE_DIR_PATH = "src/templates/"
 CONFIG_TEMPLATE_NAME = "amfcfg.conf.j2"
+SCTPLB_CONFIG_DIR_PATH = "/etc/sctplb"
+SCTPLB_CONFIG_FILE_NAME = "sctplb.yaml"
+SCTPLB_CONFIG_TEMPLATE_NAME = "sctplb.yaml.j2"
+# Locations of the sctplb binary in the upstream image and in an SD-Core rock.
+SCTPLB_BINARY_PATHS = ["/usr/local/bin/sctplb", "/sdcore/bin/sctplb", "/bin/sctplb"]
+JINJA_BYTECODE_CACHE_DIR_PATH = ".jinja2-cache"
 WORKLOAD_VERSION_FILE_NAME = "/etc/workload-version"
 CERTS_DIR_PATH = "/support/TLS"
 PRIVATE_KEY_NAME = "amf.key"
@@ -69,21 +104,96 @@ FIVEG_NRF_RELATION_NAME = "fiveg_nrf"
 SDCORE_CONFIG_RELATION_NAME = "sdcore_config"
 TLS_RELATION_NAME = "certificates"
 REPLICAS_RELATION_NAME = "replicas"
+DATABASE_RELATION_NAME = "database"
+DATABASE_NAME = "sdcore_amf"
+CGROUP_CPU_MAX_PATH = "/sys/fs/cgroup/cpu.max"
+CGROUP_MEMORY_MAX_PATH = "/sys/fs/cgroup/memory.max"
+GO_MEMORY_LIMIT_RATIO = 0.9
+GO_MEMORY_LIMIT_PATTERN = re.compile(r"^\d+(B|KiB|MiB|GiB|TiB)?$")
+# (resource, limit config option, request config option)
+COMPUTE_RESOURCE_CONFIGS = [
+    ("cpu", "cpu-limit", "cpu-request"),
+    ("memory", "memory-limit", "memory-request"),
+]
+COMPUTE_RESOURCE_OPTIONS = [
+    "cpu-limit",
+    "cpu-request",
+    "memory-limit",
+    "memory-request",
+    "hugepages-2mi",
+]
+HUGEPAGES_RESOURCE_NAME = "hugepages-2Mi"
+COMPUTE_RESOURCE_NAMES = [resource for resource, _, _ in COMPUTE_RESOURCE_CONFIGS] + [
+    HUGEPAGES_RESOURCE_NAME
+]
+DEBUG_PROFILE_PORT = 5001
+PROFILES_DIR_PATH = "/var/lib/amf/profiles"
+MAX_STORED_PROFILES = 5
+PROFILE_CAPTURE_TIMEOUT_MARGIN = 30
+# Dot-separated labels of letters, digits and hyphens (3GPP TS 23.003)
+DNN_LABEL_PATTERN = r"[A-Za-z0-9]([A-Za-z0-9-]*[A-Za-z0-9])?"
+DNN_PATTERN = re.compile(rf"^(?=.{{1,100}}$){DNN_LABEL_PATTERN}(\.{DNN_LABEL_PATTERN})*$")
+AMF_LIVENESS_CHECK_NAME = "amf-liveness"
+PEBBLE_DURATION_PATTERN = re.compile(r"^\d+(ms|s|m|h)$")
+GO_DURATION_COMPONENT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ns|us|µs|ms|s|m|h)")
+GO_DURATION_UNITS = {
+    "ns": 1e-9, "us": 1e-6, "µs": 1e-6, "ms": 1e-3, "s": 1, "m": 60, "h": 3600
+}
+LOAD_BALANCER_WATCHER_PATH = "src/load_balancer_watcher.py"
+LOAD_BALANCER_WATCH_TIMEOUT = 600
+# Index of the starttime field of /proc/<pid>/stat, counted after the process name.
+PROC_STAT_START_TIME_INDEX = 19
+LOAD_BALANCER_NOTICE_KEY = "canonical.com/sdcore-amf-k8s/load-balancer-address"
+RESTART_TIMER_PATH = "src/notice_timer.py"
+RESTART_NOTICE_KEY = "canonical.com/sdcore-amf-k8s/restart"
+MAINTENANCE_WINDOW_PATTERN = re.compile(
+    r"^(?:[01]\d|2[0-3]):[0-5]\d-(?:[01]\d|2[0-3]):[0-5]\d$"
+)
+# Restart with a renewed certificate at the latest this long before the old one expires
+CERTIFICATE_RELOAD_MARGIN = 3600
 
 
 class AMFOperatorCharm(CharmBase):
     """Main class to describe juju event handling for the SD-Core AMF operator for K8s."""
 
+    _stored = StoredState()
+
     def __init__(self, *args):
         super().__init__(*args)
+        self._stored.set_default(
+            reconciled_inputs_hash="",
+            pushed_files={},
+            load_balancer_watcher_pid=0,
+            load_balancer_watcher_start_time=0,
+            leader_elected_at=0.0,
+            sctplb_configured=False,
+            compute_resources_hash="",
+            pod_compute_resources_hash="",
+            restart_pending=False,
+            restart_timer_pid=0,
+            restart_timer_start_time=0,
+            restart_count=0,
+            last_restart_at=0.0,
+            restart_due_at=0.0,
+            certificate_expires_at=0.0,
+            serving_certificate_expires_at=0.0,
+        )
         self.replicas = self.model.get_relation(REPLICAS_RELATION_NAME)
         self.framework.observe(self.on.collect_unit_status, self._on_collect_unit_status)
         self._amf_container_name = self._amf_service_name = "amf"
         self._amf_container = self.unit.get_container(self._amf_container_name)
+        self._sctplb_container_name = self._sctplb_service_name = "sctplb"
+        self._sctplb_container = self.unit.get_container(self._sctplb_container_name)
         self._nrf_requires = NRFRequires(charm=self, relation_name=FIVEG_NRF_RELATION_NAME)
         self._webui_requires = SdcoreConfigRequires(
             charm=self, relation_name=SDCORE_CONFIG_RELATION_NAME
         )
+        self._database = DatabaseRequires(
+            self,
+            relation_name=DATABASE_RELATION_NAME,
+            database_name=DATABASE_NAME,
+            extra_user_roles="admin",
+        )
         self.n2_provider = N2Provides(self, N2_RELATION_NAME)
         self._certificates = TLSCertificatesRequiresV4(
             charm=self,
@@ -109,17 +219,47 @@ class AMFOperatorCharm(CharmBase):
             app_name=self.app.name,
             unit_id=self.unit.name.split("/")[-1],
         )
+        self.k8s_compute_resources = K8sComputeResources(
+            namespace=self.model.name,
+            statefulset_name=self.app.name,
+            pod_name=f"{self.app.name}-{self.unit.name.split('/')[-1]}",
+            container_name=self._amf_container_name,
+            field_manager=self.app.name,
+            managed_resources=COMPUTE_RESOURCE_NAMES,
+        )
+        self._snapshot = HookSnapshot(
+            container=self._amf_container,
+            service_name=self._amf_service_name,
+            k8s_service=self.k8s_service,
+            nrf_requires=self._nrf_requires,
+            webui_requires=self._webui_requires,
+            certificates=self._certificates,
+            certificate_request=self._get_certificate_request(),
+            get_pod_ip=_get_pod_ip,
+            workload_version_path=WORKLOAD_VERSION_FILE_NAME,
+        )
         self.framework.observe(self.on.remove, self._on_remove)
-        self.framework.observe(self.on.leader_elected, self._configure_amf)
+        self.framework.observe(self.on.capture_profile_action, self._on_capture_profile_action)
+        self.framework.observe(self.on.capture_heap_action, self._on_capture_heap_action)
+        self.framework.observe(self.on.upgrade_charm, self._on_upgrade_charm)
+        self.framework.observe(self.on.leader_elected, self._on_leader_elected)
         self.framework.observe(self.on.replicas_relation_changed, self._configure_amf)
+        self.framework.observe(self.on.replicas_relation_departed, self._configure_amf)
         self.framework.observe(self.on.config_changed, self._configure_amf)
         self.framework.observe(self.on.update_status, self._configure_amf)
         self.framework.observe(self.on.amf_pebble_ready, self._configure_amf)
+        self.framework.observe(self.on.sctplb_pebble_ready, self._configure_amf)
+        self.framework.observe(
+            self.on.amf_pebble_custom_notice, self._on_amf_pebble_custom_notice
+        )
         self.framework.observe(self._nrf_requires.on.nrf_available, self._configure_amf)
         self.framework.observe(self.on.fiveg_nrf_relation_joined, self._configure_amf)
         self.framework.observe(self._webui_requires.on.webui_url_available, self._configure_amf)
         self.framework.observe(self.on.fiveg_n2_relation_joined, self._on_n2_relation_joined)
         self.framework.observe(self.on.certificates_relation_joined, self._configure_amf)
+        self.framework.observe(self._database.on.database_created, self._configure_amf)
+        self.framework.observe(self._database.on.endpoints_changed, self._configure_amf)
+        self.framework.observe(self.on.database_relation_broken, self._configure_amf)
         self.framework.observe(self.on.sdcore_config_relation_joined, self._configure_amf)
         self.framework.observe(
             self.on.certificates_relation_broken, self._on_certificates_relation_broken
@@ -135,38 +275,425 @@ class AMFOperatorCharm(CharmBase):
         workload, runs the Pebble services and expose the service information through
         charm's interface.
 
+        Only the leader runs the AMF workload, unless the SCTP load balancer is enabled,
+        in which case every unit runs it behind the leader's `sctplb` service.
+
         Args:
             _ (EventBase): Juju event
         """
-        if not self.unit.is_leader():
-            logger.info("Unit `%s` is not leader", self.unit.name)
-            if self._amf_service_is_running():
-                logger.debug("Stopping `%s` service", self._amf_service_name)
-                self._amf_container.stop(self._amf_service_name)
-                logger.debug(
-                    "Stopped service `%s` in non-leader unit", self._amf_service_name
-                )
+        if self._get_sctp_load_balancer_config():
+            self._publish_replica_address()
+        if not self._amf_service_should_run():
+            self._configure_standby()
             return
-        if self.replicas:
-            self.replicas.data[self.app]["leader"] = self.unit.name
-        if not self.k8s_service.is_created():
-            self.k8s_service.create()
+        if self.unit.is_leader():
+            self._configure_leader_resources()
         if not self.ready_to_configure():
             logger.info("The preconditions for the configuration are not met yet.")
             return
-        if not self._certificate_is_available():
+        if self._certificate_is_pending():
             logger.info("The certificate is not available yet.")
             return
-        certificate_update_required = self._check_and_update_certificate()
+        self._resume_pending_restart()
+        reconcile_inputs_hash = self._get_reconcile_inputs_hash()
+        if self._is_reconciled(reconcile_inputs_hash):
+            logger.debug("Reconcile inputs unchanged and AMF is running, nothing to do")
+            return
+        self._reconcile_workload()
+        if self.unit.is_leader():
+            try:
+                self._set_n2_information()
+            except ValueError:
+                return
+        if self._workload_is_running():
+            self._stored.reconciled_inputs_hash = reconcile_inputs_hash
+            self._report_failover_duration()
+
+    def _configure_leader_resources(self) -> None:
+        """Record the leader in the peer relation and configure the external service."""
+        if self.replicas:
+            self.replicas.data[self.app]["leader"] = self.unit.name
+        self._configure_k8s_service()
+        self._configure_compute_resources()
+
+    def _configure_compute_resources(self) -> None:
+        """Patch the configured CPU and memory resources onto the StatefulSet.
+
+        The resources last applied are recorded, so that the StatefulSet is only read
+        again when the resource options change.
+        """
+        if self._get_invalid_compute_resource_configs():
+            return
+        resources = self._get_compute_resources()
+        resources_hash = _hash_compute_resources(resources)
+        if resources_hash == self._stored.compute_resources_hash:
+            return
+        try:
+            if not self.k8s_compute_resources.statefulset_is_patched(resources):
+                self.k8s_compute_resources.patch(resources)
+        except ApiError as e:
+            logger.warning("Failed to patch the StatefulSet resources: %s", e)
+            return
+        self._stored.compute_resources_hash = resources_hash
+
+    def _compute_resources_are_pending(self) -> bool:
+        """Return whether this unit's pod still runs without the configured resources.
+
+        Once the pod matches the configured resources, it is only read again when the
+        resource options change.
+
+        Returns:
+            bool: True if resources are configured but not applied to the pod yet.
+        """
+        if self._get_invalid_compute_resource_configs():
+            return False
+        resources = self._get_compute_resources()
+        if not resources.limits and not resources.requests:
+            return False
+        resources_hash = _hash_compute_resources(resources)
+        if resources_hash == self._stored.pod_compute_resources_hash:
+            return False
+        if not self.k8s_compute_resources.pod_is_patched(resources):
+            return True
+        self._stored.pod_compute_resources_hash = resources_hash
+        return False
+
+    def _reconcile_workload(self) -> None:
+        """Push the TLS material and config file, then (re)start the Pebble services.
+
+        The AMF is only restarted for config changes it does not reload from its config
+        file at runtime, and for a new certificate. When a maintenance window is
+        configured, the restart loading a renewed certificate waits for that window.
+        """
+        if self.unit.is_leader():
+            self.k8s_service.set_active_pod()
+        certificate_update_required = (
+            self._sbi_tls_is_enabled() and self._check_and_update_certificate()
+        )
         desired_config_file = self._generate_amf_config_file()
-        if config_update_required := self._is_config_update_required(desired_config_file):
+        config_change = ConfigChange.NO_OP
+        if self._is_config_update_required(desired_config_file):
+            config_change = classify_config_change(
+                current=self._snapshot.read(f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}"),
+                desired=desired_config_file,
+            )
+            logger.info("AMF config file change is %s", config_change.value)
             self._push_config_file(content=desired_config_file)
-        should_restart = config_update_required or certificate_update_required
+        should_restart = config_change == ConfigChange.NEEDS_RESTART or (
+            certificate_update_required and not self._postpone_certificate_reload()
+        )
         self._configure_pebble(restart=should_restart)
+        self._configure_sctplb()
+
+    def _amf_service_should_run(self) -> bool:
+        """Return whether this unit should run the AMF service.
+
+        Returns:
+            bool: True for the leader, and for every unit when the SCTP load balancer
+                is enabled.
+        """
+        return self.unit.is_leader() or self._get_sctp_load_balancer_config()
+
+    def _workload_is_running(self) -> bool:
+        """Return whether every service this unit should run is running.
+
+        Returns:
+            bool: Whether the AMF service, and the sctplb service on the leader when the
+                SCTP load balancer is enabled, are running.
+        """
+        if not self._amf_service_is_running():
+            return False
+        if self.unit.is_leader() and self._get_sctp_load_balancer_config():
+            return self._sctplb_service_is_running()
+        return True
+
+    def _publish_replica_address(self) -> None:
+        """Publish this unit's pod IP in the peer relation for the SCTP load balancer."""
+        if not self.replicas or not (pod_ip := self._snapshot.pod_ip):
+            return
+        if self.replicas.data[self.unit].get("address") != pod_ip:
+            self.replicas.data[self.unit]["address"] = pod_ip
+
+    def _get_amf_replica_addresses(self) -> List[str]:
+        """Return the pod IPs of every unit running the AMF workload.
+
+        Returns:
+            list: Sorted pod IP addresses, including this unit's.
+        """
+        addresses = set()
+        if pod_ip := self._snapshot.pod_ip:
+            addresses.add(pod_ip)
+        if self.replicas:
+            for unit in self.replicas.units:
+                if address := self.replicas.data[unit].get("address"):
+                    addresses.add(address)
+        return sorted(addresses)
+
+    def _configure_sctplb(self) -> None:
+        """Run the SCTP load balancer on the leader, stop it everywhere else."""
+        if not self.unit.is_leader() or not self._get_sctp_load_balancer_config():
+            self._stop_sctplb_service()
+            return
+        if not self._sctplb_container.can_connect():
+            logger.info("Cannot connect to the %s container yet", self._sctplb_container_name)
+            return
+        if not (binary_path := self._get_sctplb_binary_path()):
+            logger.error("No sctplb binary found in the %s container", self._sctplb_container_name)
+            return
+        layer = self._get_sctplb_pebble_layer(binary_path)
+        config_path = f"{SCTPLB_CONFIG_DIR_PATH}/{SCTPLB_CONFIG_FILE_NAME}"
+        desired_config_file = self._generate_sctplb_config_file()
+        config_update_required = not self._sctplb_container.exists(config_path) or (
+            self._sctplb_container.pull(config_path).read() != desired_config_file
+        )
+        if config_update_required:
+            self._sctplb_container.push(config_path, source=desired_config_file, make_dirs=True)
+            logger.info("Pushed %s config file", SCTPLB_CONFIG_FILE_NAME)
+        plan = self._sctplb_container.get_plan()
+        if plan.services != layer.services:
+            self._sctplb_container.add_layer(self._sctplb_container_name, layer, combine=True)
+            logger.info("New layer added: %s", layer)
+        self._sctplb_container.replan()
+        if config_update_required:
+            self._sctplb_container.restart(self._sctplb_service_name)
+            logger.info("Restarted service %s", self._sctplb_service_name)
+        self._stored.sctplb_configured = True
+
+    def _get_sctplb_binary_path(self) -> Optional[str]:
+        """Return the path of the sctplb binary shipped by the sctplb image.
+
+        Returns:
+            str/None: Path of the binary, or None if the image ships none.
+        """
+        for path in SCTPLB_BINARY_PATHS:
+            if self._sctplb_container.exists(path):
+                return path
+        return None
+
+    def _stop_sctplb_service(self) -> None:
+        """Stop the SCTP load balancer if this unit ran it."""
+        if not self._stored.sctplb_configured:
+            return
+        if not self._sctplb_container.can_connect():
+            return
+        if self._sctplb_service_is_running():
+            self._sctplb_container.stop(self._sctplb_service_name)
+            logger.info("Stopped service %s", self._sctplb_service_name)
+        self._stored.sctplb_configured = False
+
+    def _sctplb_service_is_running(self) -> bool:
+        """Return whether the SCTP load balancer service is running.
+
+        Returns:
+            bool: Whether the sctplb service is running.
+        """
+        if not self._sctplb_container.can_connect():
+            return False
         try:
-            self._set_n2_information()
-        except ValueError:
+            service = self._sctplb_container.get_service(self._sctplb_service_name)
+        except ModelError:
+            return False
+        return service.is_running()
+
+    def _generate_sctplb_config_file(self) -> str:
+        """Render the SCTP load balancer config file.
+
+        Returns:
+            str: Content of the rendered config file.
+        """
+        return _get_template(SCTPLB_CONFIG_TEMPLATE_NAME).render(
+            amf_addresses=self._get_amf_replica_addresses(),
+            ngap_ip_list=self._get_ngap_ip_list(),
+            ngapp_port=NGAPP_PORT,
+            sctp_grpc_port=SCTP_GRPC_PORT,
+            log_level=self._get_log_level_config(),
+        )
+
+    def _on_leader_elected(self, event: LeaderElectedEvent) -> None:
+        """Take over the AMF workload, timing the failover from a previous leader.
+
+        The first election of a deployment is not a failover, so it is not timed.
+
+        Args:
+            event (LeaderElectedEvent): Juju event
+        """
+        if self._get_previous_leader() not in (None, self.unit.name):
+            self._stored.leader_elected_at = time.time()
+        self._configure_amf(event)
+
+    def _get_previous_leader(self) -> Optional[str]:
+        """Return the name of the unit last recorded as leader in the peer relation.
+
+        Returns:
+            str/None: Unit name, or None if no leader was recorded yet.
+        """
+        if not self.replicas:
+            return None
+        return self.replicas.data[self.app].get("leader")
+
+    def _configure_standby(self) -> None:
+        """Keep a non-leader unit in standby.
+
+        The AMF service is stopped. In warm standby mode, the config file, the TLS
+        material and the Pebble layer are staged as well, so that becoming leader
+        only requires starting the service.
+        """
+        logger.info("Unit `%s` is not leader", self.unit.name)
+        self._stored.reconciled_inputs_hash = ""
+        self._stop_amf_service()
+        self._stop_sctplb_service()
+        if not self._get_warm_standby_config():
+            return
+        if not self.ready_to_configure() or self._certificate_is_pending():
+            logger.info("The preconditions for staging the warm standby are not met yet.")
+            return
+        if self._sbi_tls_is_enabled():
+            self._check_and_update_certificate()
+        desired_config_file = self._generate_amf_config_file()
+        if self._is_config_update_required(desired_config_file):
+            self._push_config_file(content=desired_config_file)
+        plan = self._amf_container.get_plan()
+        if plan.services != self._amf_pebble_layer.services:
+            self._amf_container.add_layer(
+                self._amf_container_name, self._amf_pebble_layer, combine=True
+            )
+            logger.info("Staged layer for warm standby: %s", self._amf_pebble_layer)
+
+    def _report_failover_duration(self) -> None:
+        """Report how long the AMF took to run after this unit was elected leader."""
+        if not self._stored.leader_elected_at:
+            return
+        failover_duration = time.time() - self._stored.leader_elected_at
+        self._stored.leader_elected_at = 0.0
+        logger.info("AMF service running %.3f seconds after leader election", failover_duration)
+        if self.replicas:
+            self.replicas.data[self.app]["failover-duration"] = f"{failover_duration:.3f}"
+
+    def _get_reconcile_inputs_hash(self) -> str:
+        """Return a digest of every input that the AMF reconciliation depends on.
+
+        Returns:
+            str: SHA-256 hex digest of the reconcile inputs.
+        """
+        provider_certificate, private_key = self._snapshot.assigned_certificate
+        inputs = {
+            "config": dict(self.model.config),
+            "nrf_url": self._snapshot.nrf_url,
+            "webui_url": self._snapshot.webui_url,
+            "certificate": _sha256(str(provider_certificate.certificate))
+            if provider_certificate
+            else None,
+            "private_key": _sha256(str(private_key)) if private_key else None,
+            "pod_ip": self._snapshot.pod_ip,
+            "n2_amf_ip": self._get_n2_amf_ip(),
+            "n2_amf_hostname": self._get_n2_amf_hostname(),
+            "n2_relation_ids": sorted(
+                relation.id for relation in self.model.relations[N2_RELATION_NAME]
+            ),
+            "workload_version": self._get_workload_version(),
+            "database_url": self._get_database_url(),
+            "amf_replica_addresses": self._get_amf_replica_addresses(),
+        }
+        return _sha256(json.dumps(inputs, sort_keys=True, default=str))
+
+    def _is_reconciled(self, reconcile_inputs_hash: str) -> bool:
+        """Return whether the workload was already reconciled against the given inputs.
+
+        Args:
+            reconcile_inputs_hash (str): Digest of the current reconcile inputs.
+
+        Returns:
+            bool: True if the inputs are unchanged since the last reconciliation, the
+                workload is running and the pushed files were not modified, False
+                otherwise.
+        """
+        if reconcile_inputs_hash != self._stored.reconciled_inputs_hash:
+            return False
+        return self._workload_is_running() and self._pushed_files_are_unmodified()
+
+    def _on_upgrade_charm(self, _: UpgradeCharmEvent) -> None:
+        """Force a full reconciliation since the new charm may render things differently.
+
+        The leader also re-applies the external service, so that a service created by
+        a previous revision gets the current pod selector. The StatefulSet resources are
+        checked again, as Juju may have rewritten the StatefulSet spec on refresh.
+        """
+        self._stored.reconciled_inputs_hash = ""
+        self._stored.compute_resources_hash = ""
+        self._stored.pod_compute_resources_hash = ""
+        if self.unit.is_leader():
+            self.k8s_service.set_active_pod()
+            self.k8s_service.create()
+
+    def _configure_k8s_service(self) -> None:
+        """Create the external LoadBalancer service and watch for its address if needed."""
+        if not self._snapshot.k8s_service_is_created:
+            self.k8s_service.create()
+            self._snapshot.record_k8s_service_created()
+        if not self._get_n2_amf_ip():
+            self._start_load_balancer_watcher()
+
+    def _start_load_balancer_watcher(self) -> None:
+        """Start a detached process waiting for the LoadBalancer service address.
+
+        Once the address is assigned, the process records a Pebble custom notice in the
+        workload container, which triggers `_on_amf_pebble_custom_notice`.
+        """
+        if _process_is_running(
+            self._stored.load_balancer_watcher_pid,
+            self._stored.load_balancer_watcher_start_time,
+        ):
+            return
+        if not self._snapshot.can_connect:
+            return
+        process = Popen(
+            [
+                sys.executable,
+                LOAD_BALANCER_WATCHER_PATH,
+                "--namespace",
+                self.model.name,
+                "--service-name",
+                f"{self.app.name}-external",
+                "--pebble-socket",
+                self._amf_container.pebble.socket_path,
+                "--notice-key",
+                LOAD_BALANCER_NOTICE_KEY,
+                "--timeout",
+                str(LOAD_BALANCER_WATCH_TIMEOUT),
+            ],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+            start_new_session=True,
+        )
+        self._stored.load_balancer_watcher_pid = process.pid
+        self._stored.load_balancer_watcher_start_time = _get_process_start_time(process.pid)
+        logger.info("Started LoadBalancer address watcher (pid %d)", process.pid)
+
+    def _on_amf_pebble_custom_notice(self, event: PebbleCustomNoticeEvent) -> None:
+        """Handle the notices recorded by the detached helper processes.
+
+        The LoadBalancer address watcher notice reconfigures the AMF, and the restart
+        timer notice runs the restart postponed by the coalescing window.
+
+        Args:
+            event (PebbleCustomNoticeEvent): Juju event
+        """
+        if event.notice.key == RESTART_NOTICE_KEY:
+            self._run_pending_restart(event)
             return
+        if event.notice.key != LOAD_BALANCER_NOTICE_KEY:
+            return
+        logger.info("LoadBalancer service address assigned")
+        self._configure_amf(event)
+
+    def _stop_amf_service(self) -> None:
+        """Stop the AMF service if it is running."""
+        if not self._amf_service_is_running():
+            return
+        logger.debug("Stopping `%s` service", self._amf_service_name)
+        self._amf_container.stop(self._amf_service_name)
+        self._snapshot.invalidate_service_status()
+        logger.debug("Stopped service `%s` in non-leader unit", self._amf_service_name)
 
     def _check_and_update_certificate(self) -> bool:
         """Check if the certificate or private key needs an update and perform the update.
@@ -179,9 +706,7 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             bool: True if either the certificate or the private key was updated, False otherwise.
         """
-        provider_certificate, private_key = self._certificates.get_assigned_certificate(
-            certificate_request=self._get_certificate_request()
-        )
+        provider_certificate, private_key = self._snapshot.assigned_certificate
         if not provider_certificate or not private_key:
             logger.debug("Certificate or private key is not available")
             return False
@@ -199,12 +724,26 @@ class AMFOperatorCharm(CharmBase):
         Args:
             event: CollectStatusEvent
         """
+        if self._compute_resources_are_pending():
+            event.add_status(WaitingStatus("Waiting for resource limits to be applied"))
+            logger.info("Waiting for resource limits to be applied")
+            return
+
+        if not self.unit.is_leader() and self._get_sctp_load_balancer_config():
+            if not self._amf_service_is_running():
+                event.add_status(WaitingStatus("Waiting for AMF service to start"))
+                logger.info("Waiting for AMF service to start")
+                return
+            event.add_status(ActiveStatus("active replica (non-leader)"))
+            return
+
         if not self.unit.is_leader():
-            event.add_status(ActiveStatus("standby (non-leader)"))
-            logger.info("Unit in standby (non-leader)")
+            standby = "warm standby" if self._get_warm_standby_config() else "standby"
+            event.add_status(ActiveStatus(f"{standby} (non-leader)"))
+            logger.info("Unit in %s (non-leader)", standby)
             return
 
-        if not self._amf_container.can_connect():
+        if not self._snapshot.can_connect:
             event.add_status(MaintenanceStatus("Waiting for service to start"))
             logger.info("Waiting for service to start")
             self.app.status = MaintenanceStatus("Waiting for service to start")
@@ -232,25 +771,31 @@ class AMFOperatorCharm(CharmBase):
                 f"Waiting for {', '.join(missing_relations)} relation(s)")
             return
 
-        if not self._nrf_requires.nrf_url:
+        if not self._snapshot.nrf_url:
             event.add_status(WaitingStatus("Waiting for NRF data to be available"))
             logger.info("Waiting for NRF data to be available")
             self.app.status = WaitingStatus("Waiting for NRF data to be available")
             return
 
-        if not self._webui_requires.webui_url:
+        if not self._snapshot.webui_url:
             event.add_status(WaitingStatus("Waiting for Webui data to be available"))
             logger.info("Waiting for Webui data to be available")
             self.app.status = WaitingStatus("Waiting for Webui data to be available")
             return
 
-        if not self._amf_container.exists(path=CONFIG_DIR_PATH):
+        if self._database_url_is_pending():
+            event.add_status(WaitingStatus("Waiting for database URI"))
+            logger.info("Waiting for database URI")
+            self.app.status = WaitingStatus("Waiting for database URI")
+            return
+
+        if not self._snapshot.exists(CONFIG_DIR_PATH):
             event.add_status(WaitingStatus("Waiting for storage to be attached"))
             logger.info("Waiting for storage to be attached")
             self.app.status = WaitingStatus("Waiting for storage to be attached")
             return
 
-        if not _get_pod_ip():
+        if not self._snapshot.pod_ip:
             event.add_status(WaitingStatus("Waiting for pod IP address to be available"))
             logger.info("Waiting for pod IP address to be available")
             self.app.status = WaitingStatus("Waiting for pod IP address to be available")
@@ -262,7 +807,7 @@ class AMFOperatorCharm(CharmBase):
             self.app.status = WaitingStatus("Waiting for MetalLB to be enabled")
             return
 
-        if not self._certificate_is_available():
+        if self._certificate_is_pending():
             event.add_status(WaitingStatus("Waiting for certificates to be available"))
             logger.info("Waiting for certificates to be available")
             self.app.status = WaitingStatus("Waiting for certificates to be available")
@@ -274,6 +819,22 @@ class AMFOperatorCharm(CharmBase):
             self.app.status = WaitingStatus("Waiting for AMF service to start")
             return
 
+        if (
+            self._get_sctp_load_balancer_config()
+            and self._sctplb_container.can_connect()
+            and not self._get_sctplb_binary_path()
+        ):
+            event.add_status(BlockedStatus("sctplb-image does not ship the sctplb binary"))
+            logger.info("sctplb-image does not ship the sctplb binary")
+            self.app.status = BlockedStatus("sctplb-image does not ship the sctplb binary")
+            return
+
+        if self._get_sctp_load_balancer_config() and not self._sctplb_service_is_running():
+            event.add_status(WaitingStatus("Waiting for SCTP load balancer to start"))
+            logger.info("Waiting for SCTP load balancer to start")
+            self.app.status = WaitingStatus("Waiting for SCTP load balancer to start")
+            return
+
         event.add_status(ActiveStatus())
         self.app.status = ActiveStatus()
 
@@ -286,17 +847,20 @@ class AMFOperatorCharm(CharmBase):
     def _missing_relations(self) -> List[str]:
         """Return list of missing relations.
 
-        If all the relations are created, it returns an empty list.
+        If all the relations are created, it returns an empty list. Behind the SCTP
+        load balancer, any replica may serve a subscriber, so the replicas have to share
+        their user equipment contexts through the database.
 
         Returns:
             list: missing relation names.
         """
         missing_relations = []
-        for relation in [
-            FIVEG_NRF_RELATION_NAME,
-            TLS_RELATION_NAME,
-            SDCORE_CONFIG_RELATION_NAME,
-        ]:
+        required_relations = [FIVEG_NRF_RELATION_NAME, SDCORE_CONFIG_RELATION_NAME]
+        if self._sbi_tls_is_enabled():
+            required_relations.insert(1, TLS_RELATION_NAME)
+        if self._get_sctp_load_balancer_config():
+            required_relations.append(DATABASE_RELATION_NAME)
+        for relation in required_relations:
             if not self._relation_created(relation):
                 missing_relations.append(relation)
         return missing_relations
@@ -307,23 +871,94 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             ready_to_configure: True if all conditions are met else False
         """
-        if not self._amf_container.can_connect():
+        if not self._snapshot.can_connect:
             return False
         if self._get_invalid_configs():
             return False
         if self._missing_relations():
             return False
-        if not self._nrf_requires.nrf_url:
+        if not self._snapshot.nrf_url:
+            return False
+        if not self._snapshot.webui_url:
             return False
-        if not self._webui_requires.webui_url:
+        if self._database_url_is_pending():
             return False
-        if not self._amf_container.exists(path=CONFIG_DIR_PATH):
+        if not self._snapshot.exists(CONFIG_DIR_PATH):
             return False
-        if not _get_pod_ip():
+        if not self._snapshot.pod_ip:
             return False
 
         return True
 
+    def _on_capture_profile_action(self, event: ActionEvent) -> None:
+        """Capture a CPU profile of the running AMF.
+
+        Args:
+            event (ActionEvent): Juju event
+        """
+        self._capture_pprof_profile(
+            event, profile="profile", seconds=int(event.params["duration"])
+        )
+
+    def _on_capture_heap_action(self, event: ActionEvent) -> None:
+        """Capture a heap profile of the running AMF.
+
+        Args:
+            event (ActionEvent): Juju event
+        """
+        self._capture_pprof_profile(event, profile="heap")
+
+    def _capture_pprof_profile(
+        self, event: ActionEvent, profile: str, seconds: Optional[int] = None
+    ) -> None:
+        """Fetch a profile from the AMF pprof endpoint into the workload filesystem.
+
+        The charm shares the network namespace of the pod, so it fetches the profile
+        itself and pushes it to the workload container. Only the most recent profiles
+        of each kind are kept.
+
+        Args:
+            event (ActionEvent): Juju event
+            profile (str): Name of the pprof profile, e.g. "profile" or "heap".
+            seconds (int): Duration of the profile, for profiles sampled over time.
+        """
+        if not self._amf_service_is_running():
+            event.fail("AMF service is not running")
+            return
+        timestamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        path = f"{PROFILES_DIR_PATH}/{profile}-{timestamp}.pb.gz"
+        url = f"http://127.0.0.1:{DEBUG_PROFILE_PORT}/debug/pprof/{profile}"
+        if seconds:
+            url += f"?seconds={seconds}"
+        try:
+            with urllib.request.urlopen(
+                url, timeout=(seconds or 0) + PROFILE_CAPTURE_TIMEOUT_MARGIN
+            ) as response:
+                content = response.read()
+            self._amf_container.push(path, content, make_dirs=True)
+        except (APIError, OSError) as e:
+            event.fail(f"Failed to capture {profile} profile: {e}")
+            return
+        self._prune_profiles(profile)
+        logger.info("Captured %s profile in %s", profile, path)
+        event.set_results({"path": path, "size": len(content)})
+
+    def _prune_profiles(self, profile: str) -> None:
+        """Remove all but the most recent stored profiles of a kind.
+
+        Args:
+            profile (str): Name of the pprof profile.
+        """
+        profiles = sorted(
+            file_info.path
+            for file_info in self._amf_container.list_files(
+                PROFILES_DIR_PATH, pattern=f"{profile}-*"
+            )
+        )
+        for path in profiles[:-MAX_STORED_PROFILES]:
+            self._amf_container.remove_path(path)
+            logger.info("Removed old profile %s", path)
+
     def _on_remove(self, event: RemoveEvent) -> None:
         # NOTE: We want to perform this removal only if the last remaining unit
         # is removed.
@@ -338,11 +973,11 @@ class AMFOperatorCharm(CharmBase):
         # dirty state in k8s, but it will be cleaned up when the juju model is
         # destroyed. It will be reused if the charm is re-deployed.
         if self.unit.is_leader():
-            if self.k8s_service.is_created():
+            if self._snapshot.k8s_service_is_created:
                 self.k8s_service.remove()
 
     def _is_config_update_required(self, content: str) -> bool:
-        """Decide whether config update is required by checking existence and config content.
+        """Decide whether config update is required.
 
         Args:
             content (str): desired config file content
@@ -350,83 +985,339 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             True if config update is required else False
         """
-        if not self._config_file_is_written() or not self._config_file_content_matches(
-            content=content
-        ):
+        return self._is_workload_file_update_required(
+            path=f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}",
+            content=content,
+            stored_content_matches=self._config_file_content_matches,
+        )
+
+    def _is_certificate_update_required(self, certificate: Certificate) -> bool:
+        return self._is_workload_file_update_required(
+            path=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}",
+            content=str(certificate),
+            stored_content_matches=lambda _: self._get_stored_certificate() == certificate,
+        )
+
+    def _is_private_key_update_required(self, private_key: PrivateKey) -> bool:
+        return self._is_workload_file_update_required(
+            path=f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}",
+            content=str(private_key),
+            stored_content_matches=lambda _: self._get_stored_private_key() == private_key,
+        )
+
+    def _is_workload_file_update_required(
+        self, path: str, content: str, stored_content_matches: Callable[[str], bool]
+    ) -> bool:
+        """Decide whether a file pushed by the charm needs to be updated in the workload.
+
+        The digest of the desired content is compared with the digest of the last pushed
+        file. The file itself is only pulled (and parsed) when the digest differs or when
+        its size or modification time differ from what was recorded at push time, which
+        catches out-of-band edits.
+
+        Args:
+            path (str): Path of the file in the workload container.
+            content (str): Desired file content.
+            stored_content_matches (Callable): Pulls the file and returns whether its
+                content matches the desired content.
+
+        Returns:
+            True if the file needs to be updated else False
+        """
+        if not (file_info := self._get_workload_file_info(path)):
             return True
+        digest = _sha256(content)
+        if self._pushed_file_matches(path=path, digest=digest, file_info=file_info):
+            return False
+        if not stored_content_matches(content):
+            return True
+        self._record_pushed_file(path=path, digest=digest, file_info=file_info)
         return False
 
-    def _config_file_is_written(self) -> bool:
-        """Return whether the config file was written to the workload container.
+    def _get_workload_file_info(self, path: str) -> Optional[FileInfo]:
+        """Return the metadata of a file in the workload container.
+
+        Args:
+            path (str): Path of the file in the workload container.
 
         Returns:
-            bool: Whether the config file was written.
+            FileInfo/None: File metadata, or None if the file does not exist.
         """
-        return bool(self._amf_container.exists(f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}"))
+        try:
+            files = self._amf_container.list_files(path, itself=True)
+        except APIError:
+            return None
+        return files[0] if files else None
 
-    def _is_certificate_update_required(self, certificate: Certificate) -> bool:
-        return self._get_existing_certificate() != certificate
+    def _pushed_file_matches(self, path: str, digest: str, file_info: FileInfo) -> bool:
+        """Return whether a file is unchanged since the charm last pushed it.
 
-    def _is_private_key_update_required(self, private_key: PrivateKey) -> bool:
-        return self._get_existing_private_key() != private_key
+        Args:
+            path (str): Path of the file in the workload container.
+            digest (str): SHA-256 digest of the desired content.
+            file_info (FileInfo): Current file metadata.
 
-    def _get_existing_certificate(self) -> Optional[Certificate]:
-        return self._get_stored_certificate() if self._certificate_is_stored() else None
+        Returns:
+            bool: Whether the digest, size and modification time match the recorded ones.
+        """
+        return self._stored.pushed_files.get(path) == {
+            "digest": digest,
+            "size": file_info.size,
+            "mtime": file_info.last_modified.isoformat(),
+        }
+
+    def _pushed_files_are_unmodified(self) -> bool:
+        """Return whether every pushed file still has the metadata recorded at push time.
 
-    def _get_existing_private_key(self) -> Optional[PrivateKey]:
-        return self._get_stored_private_key() if self._private_key_is_stored() else None
+        Only the file metadata is listed, so that out-of-band edits are caught on every
+        hook without pulling the files.
+
+        Returns:
+            bool: Whether the size and modification time of every pushed file match.
+        """
+        for path, recorded_file in self._stored.pushed_files.items():
+            file_info = self._get_workload_file_info(path)
+            if (
+                not file_info
+                or file_info.size != recorded_file["size"]
+                or file_info.last_modified.isoformat() != recorded_file["mtime"]
+            ):
+                logger.info("%s was modified out of band", path)
+                return False
+        return True
+
+    def _record_pushed_file(self, path: str, digest: str, file_info: Optional[FileInfo]) -> None:
+        """Record the digest and metadata of a file present in the workload.
+
+        Args:
+            path (str): Path of the file in the workload container.
+            digest (str): SHA-256 digest of the file content.
+            file_info (FileInfo/None): File metadata.
+        """
+        if not file_info:
+            self._forget_pushed_file(path)
+            return
+        self._stored.pushed_files[path] = {
+            "digest": digest,
+            "size": file_info.size,
+            "mtime": file_info.last_modified.isoformat(),
+        }
+
+    def _forget_pushed_file(self, path: str) -> None:
+        """Forget the recorded digest and metadata of a file.
+
+        Args:
+            path (str): Path of the file in the workload container.
+        """
+        self._stored.pushed_files.pop(path, None)
 
     def _configure_pebble(self, restart=False) -> None:
         """Configure the Pebble layer.
 
+        When this starts the AMF, the expiry of the certificate it loads is recorded.
+
         Args:
             restart (bool): Whether to restart the AMF container.
         """
+        was_running = self._amf_service_is_running()
         plan = self._amf_container.get_plan()
-        if (plan.services != self._amf_pebble_layer.services or
-                plan.checks != self._amf_pebble_layer.checks):
+        if plan.services != self._amf_pebble_layer.services or not _checks_match(
+            plan.checks, self._amf_pebble_layer.checks
+        ):
             self._amf_container.add_layer(
                 self._amf_container_name, self._amf_pebble_layer, combine=True
             )
             self._amf_container.replan()
             logger.info("New layer added: %s", self._amf_pebble_layer)
-        if restart:
-            self._amf_container.restart(self._amf_service_name)
-            logger.info("Restarted container %s", self._amf_service_name)
+        if restart and not self._restart_is_coalesced():
+            self._restart_amf_service()
             return
+        if restart:
+            self._schedule_restart(
+                due_at=self._stored.last_restart_at + self._get_restart_coalescing_window_config()
+            )
         self._amf_container.replan()
+        self._snapshot.invalidate_service_status()
+        if not was_running and self._amf_service_is_running():
+            self._stored.serving_certificate_expires_at = self._stored.certificate_expires_at
+
+    def _restart_is_coalesced(self) -> bool:
+        """Return whether a restart requested now falls in the coalescing window.
+
+        Returns:
+            bool: Whether the running AMF was restarted less than
+                `restart-coalescing-window` seconds ago.
+        """
+        if not self._amf_service_is_running():
+            return False
+        window = self._get_restart_coalescing_window_config()
+        return time.time() - self._stored.last_restart_at < window
+
+    def _restart_amf_service(self) -> None:
+        """Restart the AMF service and record the restart."""
+        self._amf_container.restart(self._amf_service_name)
+        self._snapshot.invalidate_service_status()
+        self._stored.restart_pending = False
+        self._stored.restart_count += 1
+        self._stored.last_restart_at = time.time()
+        self._stored.serving_certificate_expires_at = self._stored.certificate_expires_at
+        self._publish_restart_stats()
+        logger.info(
+            "Restarted container %s (restart #%d)",
+            self._amf_service_name,
+            self._stored.restart_count,
+        )
+
+    def _postpone_certificate_reload(self) -> bool:
+        """Schedule the restart loading a renewed certificate in the maintenance window.
+
+        The restart is brought forward when the certificate the AMF serves expires
+        before the window opens.
+
+        Returns:
+            bool: Whether the restart was postponed, False if it has to happen now.
+        """
+        if not (window := self._get_maintenance_window_config()):
+            return False
+        if not self._amf_service_is_running():
+            return False
+        now = time.time()
+        due_at = min(
+            _get_next_maintenance_window_start(window, now),
+            self._stored.serving_certificate_expires_at - CERTIFICATE_RELOAD_MARGIN,
+        )
+        if due_at <= now:
+            return False
+        logger.info("Renewed certificate will be loaded in the maintenance window")
+        self._schedule_restart(due_at=due_at)
+        return True
+
+    def _resume_pending_restart(self) -> None:
+        """Start the restart timer again if it did not survive, e.g. a charm pod restart."""
+        if not self._stored.restart_pending:
+            return
+        if _process_is_running(
+            self._stored.restart_timer_pid, self._stored.restart_timer_start_time
+        ):
+            return
+        self._schedule_restart(due_at=self._stored.restart_due_at)
+
+    def _schedule_restart(self, due_at: float) -> None:
+        """Postpone the AMF restart until the given time.
+
+        A detached timer records a Pebble custom notice at that time, which triggers
+        `_on_amf_pebble_custom_notice`. Restarts requested while a restart is pending
+        are folded into it, at the earliest of their due times.
+
+        Args:
+            due_at (float): UNIX time at which the AMF should be restarted.
+        """
+        if self._stored.restart_pending:
+            if self._stored.restart_due_at <= due_at and _process_is_running(
+                self._stored.restart_timer_pid, self._stored.restart_timer_start_time
+            ):
+                logger.info("AMF restart already pending")
+                return
+            due_at = min(due_at, self._stored.restart_due_at)
+        self._stored.restart_pending = True
+        self._stored.restart_due_at = due_at
+        delay = math.ceil(due_at - time.time())
+        process = Popen(
+            [
+                sys.executable,
+                RESTART_TIMER_PATH,
+                "--pebble-socket",
+                self._amf_container.pebble.socket_path,
+                "--notice-key",
+                RESTART_NOTICE_KEY,
+                "--delay",
+                str(max(delay, 0)),
+            ],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+            start_new_session=True,
+        )
+        self._stored.restart_timer_pid = process.pid
+        self._stored.restart_timer_start_time = _get_process_start_time(process.pid)
+        logger.info("AMF restart postponed by %d seconds (timer pid %d)", delay, process.pid)
+
+    def _run_pending_restart(self, event: PebbleCustomNoticeEvent) -> None:
+        """Run the AMF restart postponed to a later time, if it is due.
+
+        Notices of timers started for a restart that was brought forward are ignored.
+
+        Args:
+            event (PebbleCustomNoticeEvent): Juju event
+        """
+        if not self._stored.restart_pending or time.time() < self._stored.restart_due_at:
+            return
+        if not self._snapshot.can_connect:
+            event.defer()
+            return
+        if not self._amf_service_is_running():
+            logger.info("AMF service is not running, dropping the pending restart")
+            self._stored.restart_pending = False
+            return
+        self._restart_amf_service()
+
+    def _publish_restart_stats(self) -> None:
+        """Publish the AMF restart counter and timestamp in the peer relation unit data."""
+        if not self.replicas:
+            return
+        self.replicas.data[self.unit].update(
+            {
+                "restart-count": str(self._stored.restart_count),
+                "last-restart": datetime.fromtimestamp(
+                    self._stored.last_restart_at, tz=timezone.utc
+                ).isoformat(timespec="seconds"),
+            }
+        )
 
     def _on_certificates_relation_broken(self, event: RelationBrokenEvent) -> None:
         """Delete TLS related artifacts and reconfigures AMF."""
-        if not self._amf_container.can_connect():
+        if not self._snapshot.can_connect:
             event.defer()
             return
         self._delete_certificate()
         self._delete_private_key()
 
     def _certificate_is_available(self) -> bool:
-        cert, key = self._certificates.get_assigned_certificate(
-            certificate_request=self._get_certificate_request()
-        )
+        cert, key = self._snapshot.assigned_certificate
         return bool(cert and key)
 
+    def _certificate_is_pending(self) -> bool:
+        """Return whether the AMF waits for its SBI certificate.
+
+        Returns:
+            bool: Whether SBI uses TLS and no certificate is assigned yet.
+        """
+        return self._sbi_tls_is_enabled() and not self._certificate_is_available()
+
     def _delete_certificate(self):
         """Delete certificate from workload."""
         if self._certificate_is_stored():
             self._amf_container.remove_path(path=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}")
+            self._snapshot.record_path_exists(f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}", False)
+            self._forget_pushed_file(f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}")
             logger.info("Removed certificate from workload")
 
     def _delete_private_key(self):
         """Delete private key from workload."""
         if self._private_key_is_stored():
             self._amf_container.remove_path(path=f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}")
+            self._snapshot.record_path_exists(f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}", False)
+            self._forget_pushed_file(f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}")
             logger.info("Removed private key from workload")
 
-    def _get_stored_certificate(self) -> Certificate:
+    def _get_stored_certificate(self) -> Optional[Certificate]:
         cert_string = str(
             self._amf_container.pull(path=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}").read()
         )
-        return Certificate.from_string(cert_string)
+        try:
+            return Certificate.from_string(cert_string)
+        except TLSCertificatesError:
+            logger.warning("Certificate stored in the workload is not valid")
+            return None
 
     def _get_stored_private_key(self) -> PrivateKey:
         key_string = str(
@@ -436,17 +1327,38 @@ class AMFOperatorCharm(CharmBase):
 
     def _certificate_is_stored(self) -> bool:
         """Return whether certificate is stored in workload."""
-        return self._amf_container.exists(path=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}")
+        return self._snapshot.exists(f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}")
 
     def _private_key_is_stored(self) -> bool:
         """Return whether private key is stored in workload."""
-        return self._amf_container.exists(path=f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}")
+        return self._snapshot.exists(f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}")
 
     def _store_certificate(self, certificate: Certificate) -> None:
-        """Store certificate in workload."""
+        """Store certificate in workload.
+
+        If the expiry of the certificate served by the running AMF was not recorded,
+        e.g. after the charm pod was recreated, it is read from the certificate about
+        to be replaced.
+        """
+        if (
+            not self._stored.serving_certificate_expires_at
+            and self._amf_service_is_running()
+            and self._certificate_is_stored()
+            and (serving_certificate := self._get_stored_certificate())
+        ):
+            self._stored.serving_certificate_expires_at = (
+                serving_certificate.expiry_time.timestamp()
+            )
         self._amf_container.push(
             path=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}", source=str(certificate)
         )
+        self._snapshot.record_path_exists(f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}", True)
+        self._record_pushed_file(
+            path=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}",
+            digest=_sha256(str(certificate)),
+            file_info=self._get_workload_file_info(f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}"),
+        )
+        self._stored.certificate_expires_at = certificate.expiry_time.timestamp()
         logger.info("Pushed certificate pushed to workload")
 
     def _store_private_key(self, private_key: PrivateKey) -> None:
@@ -455,6 +1367,12 @@ class AMFOperatorCharm(CharmBase):
             path=f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}",
             source=str(private_key),
         )
+        self._snapshot.record_path_exists(f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}", True)
+        self._record_pushed_file(
+            path=f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}",
+            digest=_sha256(str(private_key)),
+            file_info=self._get_workload_file_info(f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}"),
+        )
         logger.info("Pushed private key to workload")
 
     def _get_workload_version(self) -> str:
@@ -468,12 +1386,7 @@ class AMFOperatorCharm(CharmBase):
             string: A human readable string representing the
             version of the workload
         """
-        if self._amf_container.exists(path=f"{WORKLOAD_VERSION_FILE_NAME}"):
-            version_file_content = self._amf_container.pull(
-                path=f"{WORKLOAD_VERSION_FILE_NAME}"
-            ).read()
-            return version_file_content
-        return ""
+        return self._snapshot.workload_version
 
     def _get_invalid_configs(self) -> list[str]:
         """Return list of invalid configurations.
@@ -482,14 +1395,64 @@ class AMFOperatorCharm(CharmBase):
             list: List of strings matching config keys.
         """
         invalid_configs = []
-        if not self._get_dnn_config():
+        if not self._is_dnn_config_valid():
             invalid_configs.append("dnn")
+        if not self._is_ngap_ip_addresses_config_valid():
+            invalid_configs.append("ngap-ip-addresses")
         if not self._is_log_level_valid():
             invalid_configs.append("log-level")
+        if not self._is_sbi_scheme_valid():
+            invalid_configs.append("sbi-scheme")
+        if not self._is_nrf_cache_eviction_interval_valid():
+            invalid_configs.append("nrf-cache-eviction-interval")
+        if not self._is_restart_coalescing_window_valid():
+            invalid_configs.append("restart-coalescing-window")
+        if not self._is_maintenance_window_valid():
+            invalid_configs.append("maintenance-window")
+        invalid_configs.extend(self._get_invalid_go_runtime_configs())
+        invalid_configs.extend(self._get_invalid_liveness_check_configs())
+        invalid_configs.extend(self._get_invalid_compute_resource_configs())
         return invalid_configs
 
-    def _get_dnn_config(self) -> Optional[str]:
-        return cast(Optional[str], self.model.config.get("dnn"))
+    def _get_dnn_config(self) -> List[str]:
+        """Return the configured Data Network Names, without duplicates.
+
+        Returns:
+            list: DNNs in the order they were configured.
+        """
+        dnn_config = cast(Optional[str], self.model.config.get("dnn")) or ""
+        return list(dict.fromkeys(dnn.strip() for dnn in dnn_config.split(",")))
+
+    def _get_ngap_ip_addresses_config(self) -> List[str]:
+        """Return the addresses the NGAP SCTP endpoint binds to.
+
+        Returns:
+            list: Configured IP addresses, without duplicates.
+        """
+        config = cast(Optional[str], self.model.config.get("ngap-ip-addresses")) or ""
+        return list(
+            dict.fromkeys(address.strip() for address in config.split(",") if address.strip())
+        )
+
+    def _is_ngap_ip_addresses_config_valid(self) -> bool:
+        try:
+            for address in self._get_ngap_ip_addresses_config():
+                ip_address(address)
+        except ValueError:
+            return False
+        return True
+
+    def _get_ngap_ip_list(self) -> List[str]:
+        """Return the NGAP bind addresses to render in the workload config files.
+
+        Returns:
+            list: The configured addresses, or the wildcard address.
+        """
+        return self._get_ngap_ip_addresses_config() or ["0.0.0.0"]
+
+    def _is_dnn_config_valid(self) -> bool:
+        dnns = self._get_dnn_config()
+        return bool(dnns) and all(DNN_PATTERN.match(dnn) for dnn in dnns)
 
     def _get_log_level_config(self) -> Optional[str]:
         return cast(Optional[str], self.model.config.get("log-level"))
@@ -498,6 +1461,169 @@ class AMFOperatorCharm(CharmBase):
         log_level = self._get_log_level_config()
         return log_level in ["debug", "info", "warn", "error", "fatal", "panic"]
 
+    def _get_sbi_scheme_config(self) -> str:
+        return cast(str, self.model.config.get("sbi-scheme", "https"))
+
+    def _is_sbi_scheme_valid(self) -> bool:
+        return self._get_sbi_scheme_config() in ["http", "https"]
+
+    def _sbi_tls_is_enabled(self) -> bool:
+        return self._get_sbi_scheme_config() == "https"
+
+    def _get_nrf_caching_config(self) -> bool:
+        return bool(self.model.config.get("nrf-caching"))
+
+    def _get_nrf_cache_eviction_interval_config(self) -> Optional[int]:
+        return cast(Optional[int], self.model.config.get("nrf-cache-eviction-interval"))
+
+    def _is_nrf_cache_eviction_interval_valid(self) -> bool:
+        eviction_interval = self._get_nrf_cache_eviction_interval_config()
+        return isinstance(eviction_interval, int) and eviction_interval > 0
+
+    def _get_restart_coalescing_window_config(self) -> int:
+        return cast(int, self.model.config.get("restart-coalescing-window", 0))
+
+    def _is_restart_coalescing_window_valid(self) -> bool:
+        return self._get_restart_coalescing_window_config() >= 0
+
+    def _get_maintenance_window_config(self) -> str:
+        return cast(str, self.model.config.get("maintenance-window", ""))
+
+    def _is_maintenance_window_valid(self) -> bool:
+        window = self._get_maintenance_window_config()
+        return not window or bool(MAINTENANCE_WINDOW_PATTERN.match(window))
+
+    def _get_liveness_check_period_config(self) -> str:
+        return cast(str, self.model.config.get("liveness-check-period", "10s"))
+
+    def _get_liveness_check_timeout_config(self) -> str:
+        return cast(str, self.model.config.get("liveness-check-timeout", "3s"))
+
+    def _get_liveness_check_threshold_config(self) -> int:
+        return cast(int, self.model.config.get("liveness-check-threshold", 3))
+
+    def _get_invalid_liveness_check_configs(self) -> List[str]:
+        """Return the AMF liveness check options with an invalid value.
+
+        Returns:
+            list: List of strings matching config keys.
+        """
+        invalid_configs = []
+        period = self._get_liveness_check_period_config()
+        timeout = self._get_liveness_check_timeout_config()
+        if not PEBBLE_DURATION_PATTERN.match(period):
+            invalid_configs.append("liveness-check-period")
+        if not PEBBLE_DURATION_PATTERN.match(timeout):
+            invalid_configs.append("liveness-check-timeout")
+        elif PEBBLE_DURATION_PATTERN.match(period) and (
+            _parse_duration(timeout) >= _parse_duration(period)
+        ):
+            invalid_configs.append("liveness-check-timeout")
+        if self._get_liveness_check_threshold_config() < 1:
+            invalid_configs.append("liveness-check-threshold")
+        return invalid_configs
+
+    def _get_gomaxprocs_config(self) -> int:
+        return cast(int, self.model.config.get("gomaxprocs", 0))
+
+    def _get_gomemlimit_config(self) -> str:
+        return cast(str, self.model.config.get("gomemlimit", ""))
+
+    def _get_gogc_config(self) -> int:
+        return cast(int, self.model.config.get("gogc", 100))
+
+    def _get_invalid_go_runtime_configs(self) -> List[str]:
+        """Return the Go runtime tuning options with an invalid value.
+
+        Returns:
+            list: List of strings matching config keys.
+        """
+        invalid_configs = []
+        if self._get_gomaxprocs_config() < 0:
+            invalid_configs.append("gomaxprocs")
+        gomemlimit = self._get_gomemlimit_config()
+        if gomemlimit and not GO_MEMORY_LIMIT_PATTERN.match(gomemlimit):
+            invalid_configs.append("gomemlimit")
+        if self._get_gogc_config() <= 0:
+            invalid_configs.append("gogc")
+        return invalid_configs
+
+    def _get_go_runtime_environment_variables(self) -> dict:
+        """Return the Go runtime tuning for the AMF process.
+
+        Explicit config values take precedence. Otherwise, GOMAXPROCS follows the
+        container's cgroup CPU quota and GOMEMLIMIT is set below the cgroup memory limit,
+        so that the Go scheduler and garbage collector respect the pod resources.
+
+        Returns:
+            dict: GOMAXPROCS, GOMEMLIMIT and GOGC, when they can be determined.
+        """
+        environment = {"GOGC": str(self._get_gogc_config())}
+        if gomaxprocs := self._get_gomaxprocs_config() or _parse_cgroup_cpu_max(
+            self._snapshot.read(CGROUP_CPU_MAX_PATH)
+        ):
+            environment["GOMAXPROCS"] = str(gomaxprocs)
+        if gomemlimit := self._get_gomemlimit_config():
+            environment["GOMEMLIMIT"] = gomemlimit
+        elif memory_max := _parse_cgroup_memory_max(self._snapshot.read(CGROUP_MEMORY_MAX_PATH)):
+            environment["GOMEMLIMIT"] = str(int(memory_max * GO_MEMORY_LIMIT_RATIO))
+        return environment
+
+    def _get_compute_resources(self) -> ResourceRequirements:
+        """Return the AMF container resources set in the charm config.
+
+        Returns:
+            ResourceRequirements: The configured limits and requests.
+        """
+        limits, requests = {}, {}
+        for resource, limit_option, request_option in COMPUTE_RESOURCE_CONFIGS:
+            if limit := self.model.config.get(limit_option):
+                limits[resource] = cast(str, limit)
+            if request := self.model.config.get(request_option):
+                requests[resource] = cast(str, request)
+        if hugepages := self.model.config.get("hugepages-2mi"):
+            # Kubernetes requires hugepages requests to equal their limits.
+            limits[HUGEPAGES_RESOURCE_NAME] = requests[HUGEPAGES_RESOURCE_NAME] = cast(
+                str, hugepages
+            )
+        return ResourceRequirements(limits=limits, requests=requests)
+
+    def _get_invalid_compute_resource_configs(self) -> List[str]:
+        """Return the resource options that are not valid Kubernetes quantities.
+
+        A request greater than its limit is also reported as invalid, as are hugepages
+        without a CPU or memory request, which Kubernetes rejects.
+
+        Returns:
+            list: List of strings matching config keys.
+        """
+        invalid_configs = []
+        quantities = {}
+        for option in COMPUTE_RESOURCE_OPTIONS:
+            if not (value := self.model.config.get(option)):
+                continue
+            try:
+                quantities[option] = parse_quantity(cast(str, value))
+            except ValueError:
+                invalid_configs.append(option)
+        for _, limit_option, request_option in COMPUTE_RESOURCE_CONFIGS:
+            limit, request = quantities.get(limit_option), quantities.get(request_option)
+            if limit is not None and request is not None and request > limit:
+                invalid_configs.append(request_option)
+        # Kubernetes defaults the requests to the limits when they are not set.
+        if "hugepages-2mi" in quantities and not any(
+            limit_option in quantities or request_option in quantities
+            for _, limit_option, request_option in COMPUTE_RESOURCE_CONFIGS
+        ):
+            invalid_configs.append("hugepages-2mi")
+        return invalid_configs
+
+    def _get_sctp_load_balancer_config(self) -> bool:
+        return bool(self.model.config.get("sctp-load-balancer"))
+
+    def _get_warm_standby_config(self) -> bool:
+        return bool(self.model.config.get("warm-standby"))
+
     def _get_external_amf_ip_config(self) -> Optional[str]:
         return cast(Optional[str], self.model.config.get("external-amf-ip"))
 
@@ -515,18 +1641,42 @@ class AMFOperatorCharm(CharmBase):
         except ValueError:
             return
 
+    def _get_database_url(self) -> Optional[str]:
+        """Return the URI of the user equipment context database.
+
+        Returns:
+            str/None: The first URI published by the database provider, or None.
+        """
+        relation = self.model.get_relation(DATABASE_RELATION_NAME)
+        if not relation or not relation.app:
+            return None
+        if not (uris := self._database.fetch_relation_field(relation.id, "uris")):
+            return None
+        return uris.split(",")[0]
+
+    def _database_url_is_pending(self) -> bool:
+        """Return whether the database relation exists but has no URI yet.
+
+        Returns:
+            bool: True if the AMF must wait for the database URI, False otherwise.
+        """
+        return self._relation_created(DATABASE_RELATION_NAME) and not self._get_database_url()
+
     def _get_n2_amf_ip(self) -> Optional[str]:
         """Return the IP to send for the N2 interface.
 
-        If a configuration is provided, it is returned, otherwise
-        returns the IP of the external LoadBalancer Service.
+        If a configuration is provided, it is returned. If NGAP binds to explicit
+        addresses, the first one is returned, otherwise returns the IP of the
+        external LoadBalancer Service.
 
         Returns:
             str/None: IP address of the AMF if available else None
         """
         if configured_ip := self._get_external_amf_ip_config():
             return configured_ip
-        return self.k8s_service.get_ip()
+        if ngap_ip_addresses := self._get_ngap_ip_addresses_config():
+            return ngap_ip_addresses[0]
+        return self._snapshot.load_balancer_ip
 
     def _get_n2_amf_hostname(self) -> str:
         """Return the hostname to send for the N2 interface.
@@ -541,7 +1691,7 @@ class AMFOperatorCharm(CharmBase):
         """
         if configured_hostname := self._get_external_amf_hostname_config():
             return configured_hostname
-        elif lb_hostname := self.k8s_service.get_hostname():
+        elif lb_hostname := self._snapshot.load_balancer_hostname:
             return lb_hostname
         return self._amf_hostname()
 
@@ -559,6 +1709,7 @@ class AMFOperatorCharm(CharmBase):
             amf_ip_address=n2_amf_ip,
             amf_hostname=n2_amf_hostname,
             amf_port=NGAPP_PORT,
+            amf_ip_addresses=self._get_ngap_ip_addresses_config() or None,
         )
 
     def _generate_amf_config_file(self) -> str:
@@ -567,13 +1718,13 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             content (str): desired config file content
         """
-        if not (dnn := self._get_dnn_config()):
+        if not (dnns := self._get_dnn_config()):
             raise ValueError("DNN configuration value is empty")
-        if not (pod_ip := _get_pod_ip()):
+        if not (pod_ip := self._snapshot.pod_ip):
             raise ValueError("Pod IP is not available")
-        if not self._nrf_requires.nrf_url:
+        if not (nrf_url := self._snapshot.nrf_url):
             raise ValueError("NRF URL is not available")
-        if not self._webui_requires.webui_url:
+        if not (webui_url := self._snapshot.webui_url):
             raise ValueError("Webui URL is not available")
         if not (log_level := self._get_log_level_config()):
             raise ValueError("Log level configuration value is empty")
@@ -582,13 +1733,19 @@ class AMFOperatorCharm(CharmBase):
             ngapp_port=NGAPP_PORT,
             sctp_grpc_port=SCTP_GRPC_PORT,
             sbi_port=SBI_PORT,
-            nrf_url=self._nrf_requires.nrf_url,
+            nrf_url=nrf_url,
             amf_ip=pod_ip,
             full_network_name=CORE_NETWORK_FULL_NAME,
             short_network_name=CORE_NETWORK_SHORT_NAME,
-            dnn=dnn,
-            scheme="https",
-            webui_uri=self._webui_requires.webui_url,
+            dnns=dnns,
+            ngap_ip_list=self._get_ngap_ip_list(),
+            scheme=self._get_sbi_scheme_config(),
+            enable_sctp_lb=self._get_sctp_load_balancer_config(),
+            enable_nrf_caching=self._get_nrf_caching_config(),
+            nrf_cache_eviction_interval=cast(int, self._get_nrf_cache_eviction_interval_config()),
+            database_url=self._get_database_url(),
+            database_name=DATABASE_NAME,
+            webui_uri=webui_url,
             log_level=log_level,
             tls_pem=f"{CERTS_DIR_PATH}/{CERTIFICATE_NAME}",
             tls_key=f"{CERTS_DIR_PATH}/{PRIVATE_KEY_NAME}",
@@ -604,8 +1761,14 @@ class AMFOperatorCharm(CharmBase):
         nrf_url: str,
         full_network_name: str,
         short_network_name: str,
-        dnn: str,
+        dnns: List[str],
+        ngap_ip_list: List[str],
         scheme: str,
+        enable_sctp_lb: bool,
+        enable_nrf_caching: bool,
+        nrf_cache_eviction_interval: int,
+        database_url: Optional[str],
+        database_name: str,
         webui_uri: str,
         log_level: str,
         tls_pem: str,
@@ -621,8 +1784,15 @@ class AMFOperatorCharm(CharmBase):
             nrf_url (str): URL of the NRF.
             full_network_name (str): Full name of the network.
             short_network_name (str): Short name of the network.
-            dnn (str): Data Network name.
+            dnns (list): Data Network Names.
+            ngap_ip_list (list): Addresses the NGAP SCTP endpoint binds to.
             scheme (str): SBI interface scheme ("http" or "https")
+            enable_sctp_lb (bool): Whether NGAP is received from an SCTP load balancer.
+            enable_nrf_caching (bool): Whether NRF discovery results are cached.
+            nrf_cache_eviction_interval (int): NRF cache eviction interval in seconds.
+            database_url (str/None): URI of the user equipment context database. The
+                context store is disabled when it is None.
+            database_name (str): Name of the user equipment context database.
             webui_uri (str) : URL of the Webui.
             log_level (str): Log level for the AMF.
             tls_pem (str): TLS certificate file.
@@ -631,9 +1801,7 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             str: Content of the rendered config file.
         """
-        jinja2_environment = Environment(loader=FileSystemLoader(CONFIG_TEMPLATE_DIR_PATH))
-        template = jinja2_environment.get_template(CONFIG_TEMPLATE_NAME)
-        content = template.render(
+        content = _get_template(CONFIG_TEMPLATE_NAME).render(
             ngapp_port=ngapp_port,
             sctp_grpc_port=sctp_grpc_port,
             sbi_port=sbi_port,
@@ -641,8 +1809,14 @@ class AMFOperatorCharm(CharmBase):
             amf_ip=amf_ip,
             full_network_name=full_network_name,
             short_network_name=short_network_name,
-            dnn=dnn,
+            dnns=dnns,
+            ngap_ip_list=ngap_ip_list,
             scheme=scheme,
+            enable_sctp_lb=enable_sctp_lb,
+            enable_nrf_caching=enable_nrf_caching,
+            nrf_cache_eviction_interval=nrf_cache_eviction_interval,
+            database_url=database_url,
+            database_name=database_name,
             webui_uri=webui_uri,
             log_level=log_level,
             tls_pem=tls_pem,
@@ -660,6 +1834,12 @@ class AMFOperatorCharm(CharmBase):
             path=f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}",
             source=content,
         )
+        self._snapshot.record_path_exists(f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}", True)
+        self._record_pushed_file(
+            path=f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}",
+            digest=_sha256(content),
+            file_info=self._get_workload_file_info(f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}"),
+        )
         logger.info("Pushed %s config file", CONFIG_FILE_NAME)
 
     def _relation_created(self, relation_name: str) -> bool:
@@ -679,12 +1859,7 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             bool: Whether the amfcfg config file content matches
         """
-        if not self._amf_container.exists(path=f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}"):
-            return False
-        existing_content = self._amf_container.pull(path=f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}")
-        if existing_content.read() != content:
-            return False
-        return True
+        return self._snapshot.read(f"{CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}") == content
 
     @property
     def _amf_pebble_layer(self) -> Layer:
@@ -693,26 +1868,74 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             Layer: Pebble Layer
         """
+        layer: LayerDict = {
+            "services": {
+                self._amf_service_name: {
+                    "override": "replace",
+                    "startup": "enabled" if self._amf_service_should_run() else "disabled",
+                    "command": f"/bin/amf --cfg {CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}",
+                    "environment": self._amf_environment_variables,
+                    "on-check-failure": {AMF_LIVENESS_CHECK_NAME: "restart"},
+                },
+            },
+            "checks": {
+                "service-readiness": {
+                    "override": "replace",
+                    "level": "ready",
+                    "tcp": {
+                        "host": "0.0.0.0",
+                        "port": SBI_PORT,
+                    }
+                },
+                AMF_LIVENESS_CHECK_NAME: self._amf_liveness_check,
+            }
+        }
+        return Layer(layer)
+
+    @property
+    def _amf_liveness_check(self) -> CheckDict:
+        """Return the Pebble check restarting an unresponsive AMF.
+
+        Behind the SCTP load balancer, the AMF receives NGAP over gRPC and the check
+        probes that port. Pebble cannot probe SCTP, and the workload image ships no
+        tools to inspect the kernel SCTP endpoints, so without the load balancer the
+        check probes the SBI port: it restarts a dead or wedged AMF process, but not
+        one whose NGAP stack alone is hung.
+        The check has no level, so that a stopped standby AMF does not make the
+        container unhealthy; a failure only restarts the AMF service.
+
+        Returns:
+            CheckDict: Pebble check definition.
+        """
+        port = SCTP_GRPC_PORT if self._get_sctp_load_balancer_config() else SBI_PORT
+        return {
+            "override": "replace",
+            "period": self._get_liveness_check_period_config(),
+            "timeout": self._get_liveness_check_timeout_config(),
+            "threshold": self._get_liveness_check_threshold_config(),
+            "tcp": {"port": port},
+        }
+
+    def _get_sctplb_pebble_layer(self, binary_path: str) -> Layer:
+        """Return pebble layer for the sctplb container.
+
+        Args:
+            binary_path (str): Path of the sctplb binary in the sctplb container.
+
+        Returns:
+            Layer: Pebble Layer
+        """
+        config_path = f"{SCTPLB_CONFIG_DIR_PATH}/{SCTPLB_CONFIG_FILE_NAME}"
         return Layer(
             {
                 "services": {
-                    self._amf_service_name: {
+                    self._sctplb_service_name: {
                         "override": "replace",
                         "startup": "enabled",
-                        "command": f"/bin/amf --cfg {CONFIG_DIR_PATH}/{CONFIG_FILE_NAME}",
-                        "environment": self._amf_environment_variables,
+                        "command": f"{binary_path} --cfg {config_path}",
+                        "environment": {"GOTRACEBACK": "crash"},
                     },
                 },
-                "checks": {
-                    "service-readiness": {
-                        "override": "replace",
-                        "level": "ready",
-                        "tcp": {
-                            "host": "0.0.0.0",
-                            "port": SBI_PORT,
-                        }
-                    }
-                }
             }
         )
 
@@ -725,8 +1948,9 @@ class AMFOperatorCharm(CharmBase):
         """
         return {
             "GOTRACEBACK": "crash",
-            "POD_IP": _get_pod_ip(),
+            "POD_IP": self._snapshot.pod_ip,
             "MANAGED_BY_CONFIG_POD": "true",
+            **self._get_go_runtime_environment_variables(),
         }
 
     def _amf_hostname(self) -> str:
@@ -743,15 +1967,198 @@ class AMFOperatorCharm(CharmBase):
         Returns:
             bool: Whether the AMF service is running.
         """
-        if not self._amf_container.can_connect():
-            logger.debug("Cannot connect to %s container", self._amf_container_name)
-            return False
-        try:
-            service = self._amf_container.get_service(self._amf_service_name)
-        except ModelError:
-            logger.debug("Service %s not found", self._amf_service_name)
-            return False
-        return service.is_running()
+        return self._snapshot.service_is_running
+
+
+@cache
+def _get_template(template_name: str) -> Template:
+    """Return a compiled config template.
+
+    Each template is compiled at most once per process. The compiled bytecode is also
+    cached in the charm directory, so that later hooks skip parsing and compiling it.
+
+    Args:
+        template_name (str): Name of the template in the templates directory.
+
+    Returns:
+        Template: The compiled config template.
+    """
+    bytecode_cache = None
+    try:
+        os.makedirs(JINJA_BYTECODE_CACHE_DIR_PATH, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR_PATH)
+    except OSError as e:
+        logger.warning("Jinja2 bytecode cache is not available: %s", e)
+    jinja2_environment = Environment(
+        loader=FileSystemLoader(CONFIG_TEMPLATE_DIR_PATH),
+        bytecode_cache=bytecode_cache,
+    )
+    return jinja2_environment.get_template(template_name)
+
+
+def _get_next_maintenance_window_start(window: str, now: float) -> float:
+    """Return when the daily maintenance window opens next.
+
+    Args:
+        window (str): Maintenance window in UTC, as `HH:MM-HH:MM`. It may span midnight.
+        now (float): Current UNIX time.
+
+    Returns:
+        float: UNIX time at which the window opens, `now` if it is open.
+    """
+    start, end = (
+        int(hours) * 60 + int(minutes)
+        for hours, minutes in (bound.split(":") for bound in window.split("-"))
+    )
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    minute_of_day = current.hour * 60 + current.minute
+    if start <= end:
+        window_is_open = start <= minute_of_day < end
+    else:
+        window_is_open = minute_of_day >= start or minute_of_day < end
+    if window_is_open:
+        return now
+    opening = current.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+        minutes=start
+    )
+    if opening.timestamp() <= now:
+        opening += timedelta(days=1)
+    return opening.timestamp()
+
+
+def _process_is_running(pid: int, start_time: int) -> bool:
+    """Return whether the process started with the given PID is still running.
+
+    The start time tells the process apart from a later one reusing its PID.
+
+    Args:
+        pid (int): Process ID, 0 if no process was started.
+        start_time (int): Start time of the process, as returned by
+            `_get_process_start_time`, 0 if unknown.
+
+    Returns:
+        bool: Whether the process is running.
+    """
+    if not pid or not start_time:
+        return False
+    return _get_process_start_time(pid) == start_time
+
+
+def _get_process_start_time(pid: int) -> int:
+    """Return the start time of a process, in clock ticks after boot.
+
+    Args:
+        pid (int): Process ID.
+
+    Returns:
+        int: Start time of the process, 0 if no such process runs.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            stat = f.read()
+    except OSError:
+        return 0
+    # The process name may contain spaces, so fields are counted after it.
+    return int(stat.rsplit(")", 1)[1].split()[PROC_STAT_START_TIME_INDEX])
+
+
+def _parse_cgroup_cpu_max(content: Optional[str]) -> Optional[int]:
+    """Return the number of CPUs allowed by a cgroup v2 `cpu.max` file.
+
+    Args:
+        content (str/None): Content of the `cpu.max` file, e.g. "200000 100000".
+
+    Returns:
+        int/None: The quota rounded up to a whole CPU, or None if there is no quota.
+    """
+    if not content:
+        return None
+    try:
+        quota, period = content.split()
+        return max(1, math.ceil(int(quota) / int(period)))
+    except ValueError:
+        return None
+
+
+def _parse_cgroup_memory_max(content: Optional[str]) -> Optional[int]:
+    """Return the memory limit in bytes from a cgroup v2 `memory.max` file.
+
+    Args:
+        content (str/None): Content of the `memory.max` file, e.g. "1073741824".
+
+    Returns:
+        int/None: The memory limit, or None if there is no limit.
+    """
+    if not content:
+        return None
+    try:
+        return int(content.strip())
+    except ValueError:
+        return None
+
+
+def _parse_duration(duration: str) -> float:
+    """Return a Pebble duration in seconds.
+
+    Args:
+        duration (str): Duration as configured, e.g. "500ms" or "10s", or as returned
+            by Pebble in Go format, e.g. "1m0s".
+
+    Returns:
+        float: The duration in seconds.
+    """
+    return sum(
+        float(value) * GO_DURATION_UNITS[unit]
+        for value, unit in GO_DURATION_COMPONENT_PATTERN.findall(duration)
+    )
+
+
+def _checks_match(actual: Mapping[str, Check], desired: Mapping[str, Check]) -> bool:
+    """Return whether Pebble checks are equivalent, whatever their duration format.
+
+    Pebble returns the durations of the plan in Go format, e.g. "1m" as "1m0s".
+
+    Args:
+        actual (Mapping[str, Check]): Checks of the Pebble plan.
+        desired (Mapping[str, Check]): Checks of the desired layer.
+
+    Returns:
+        bool: Whether the checks are equivalent.
+    """
+    return {name: _normalize_check(check) for name, check in actual.items()} == {
+        name: _normalize_check(check) for name, check in desired.items()
+    }
+
+
+def _normalize_check(check: Check) -> Dict[str, Any]:
+    return {
+        key: _parse_duration(cast(str, value)) if key in ("period", "timeout") else value
+        for key, value in check.to_dict().items()
+    }
+
+
+def _hash_compute_resources(resources: ResourceRequirements) -> str:
+    """Return a digest of container resources.
+
+    Args:
+        resources (ResourceRequirements): Container limits and requests.
+
+    Returns:
+        str: SHA-256 hex digest of the resources.
+    """
+    return _sha256(json.dumps(resources.to_dict(), sort_keys=True))
+
+
+def _sha256(content: str) -> str:
+    """Return the SHA-256 hex digest of a string.
+
+    Args:
+        content (str): String to hash.
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha256(content.encode()).hexdigest()
 
 
 def _get_pod_ip() -> Optional[str]:
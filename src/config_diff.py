@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Classify AMF config file changes by their effect on the running workload."""
+
+import logging
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Sections the AMF reloads when its config file changes on disk.
+HOT_RELOADABLE_CONFIG_PATHS = frozenset({"logger", "configuration.supportDnnList"})
+
+
+class ConfigChange(Enum):
+    """Effect of a config file change on the running AMF."""
+
+    NO_OP = "no-op"
+    HOT_RELOADABLE = "hot-reloadable"
+    NEEDS_RESTART = "needs restart"
+
+
+def classify_config_change(
+    current: Optional[str],
+    desired: str,
+    hot_reloadable_paths: Iterable[str] = HOT_RELOADABLE_CONFIG_PATHS,
+) -> ConfigChange:
+    """Compare two config files semantically and classify the change.
+
+    Formatting, comments and key order are ignored. A change is hot-reloadable when
+    every changed setting lives under one of the hot-reloadable paths.
+
+    Args:
+        current (str/None): Content of the config file in use, if any.
+        desired (str): Content of the new config file.
+        hot_reloadable_paths (Iterable[str]): Dotted paths the AMF reloads at runtime.
+
+    Returns:
+        ConfigChange: How the AMF has to take the new config file into account.
+    """
+    if current is None:
+        return ConfigChange.NEEDS_RESTART
+    try:
+        current_settings = _flatten(yaml.safe_load(current))
+        desired_settings = _flatten(yaml.safe_load(desired))
+    except yaml.YAMLError:
+        logger.warning("Could not parse the AMF config file, assuming a restart is needed")
+        return ConfigChange.NEEDS_RESTART
+    changed_paths = {
+        path
+        for path in current_settings.keys() | desired_settings.keys()
+        if current_settings.get(path) != desired_settings.get(path)
+    }
+    if not changed_paths:
+        return ConfigChange.NO_OP
+    if all(_is_under(path, hot_reloadable_paths) for path in changed_paths):
+        logger.debug("Hot-reloadable config changes: %s", sorted(changed_paths))
+        return ConfigChange.HOT_RELOADABLE
+    logger.debug("Config changes needing a restart: %s", sorted(changed_paths))
+    return ConfigChange.NEEDS_RESTART
+
+
+def _flatten(settings: Any, prefix: str = "") -> Dict[str, Any]:
+    """Return the settings as a mapping of dotted paths to values.
+
+    Lists are kept whole, so that a change in a list item is reported on the list.
+    """
+    if not isinstance(settings, dict):
+        return {prefix: settings}
+    flattened: Dict[str, Any] = {}
+    for key, value in settings.items():
+        flattened.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flattened
+
+
+def _is_under(path: str, parent_paths: Iterable[str]) -> bool:
+    return any(path == parent or path.startswith(f"{parent}.") for parent in parent_paths)
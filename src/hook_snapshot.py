@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""HookSnapshot class to cache workload and model facts for a single dispatch."""
+
+import logging
+from functools import cached_property
+from typing import Callable, Dict, Optional, Tuple
+
+from charms.sdcore_nms_k8s.v0.sdcore_config import SdcoreConfigRequires
+from charms.sdcore_nrf_k8s.v0.fiveg_nrf import NRFRequires
+from charms.tls_certificates_interface.v4.tls_certificates import (
+    CertificateRequestAttributes,
+    PrivateKey,
+    ProviderCertificate,
+    TLSCertificatesRequiresV4,
+)
+from ops import Container, ModelError
+from ops.pebble import APIError, PathError
+
+from k8s_service import K8sService
+
+logger = logging.getLogger(__name__)
+
+
+class HookSnapshot:
+    """Facts about the workload and the model, fetched at most once per dispatch.
+
+    Juju instantiates the charm once per dispatch, so a snapshot created in the charm
+    constructor lives exactly as long as the hook. Code that changes the workload
+    (pushing or removing files, stopping or replanning services, creating the external
+    service) must record the change here so that later reads stay accurate.
+    """
+
+    def __init__(
+        self,
+        container: Container,
+        service_name: str,
+        k8s_service: K8sService,
+        nrf_requires: NRFRequires,
+        webui_requires: SdcoreConfigRequires,
+        certificates: TLSCertificatesRequiresV4,
+        certificate_request: CertificateRequestAttributes,
+        get_pod_ip: Callable[[], Optional[str]],
+        workload_version_path: str,
+    ):
+        self._container = container
+        self._service_name = service_name
+        self._k8s_service = k8s_service
+        self._nrf_requires = nrf_requires
+        self._webui_requires = webui_requires
+        self._certificates = certificates
+        self._certificate_request = certificate_request
+        self._get_pod_ip = get_pod_ip
+        self._workload_version_path = workload_version_path
+        self._path_exists: Dict[str, bool] = {}
+        self._file_contents: Dict[str, Optional[str]] = {}
+
+    @cached_property
+    def pod_ip(self) -> Optional[str]:
+        """Return the pod IP address."""
+        return self._get_pod_ip()
+
+    @cached_property
+    def can_connect(self) -> bool:
+        """Return whether Pebble is reachable in the workload container."""
+        return self._container.can_connect()
+
+    @cached_property
+    def nrf_url(self) -> Optional[str]:
+        """Return the NRF URL published over the `fiveg_nrf` relation."""
+        return self._nrf_requires.nrf_url
+
+    @cached_property
+    def webui_url(self) -> Optional[str]:
+        """Return the Webui URL published over the `sdcore_config` relation."""
+        return self._webui_requires.webui_url
+
+    @cached_property
+    def assigned_certificate(self) -> Tuple[Optional[ProviderCertificate], Optional[PrivateKey]]:
+        """Return the certificate and private key assigned by the TLS provider."""
+        return self._certificates.get_assigned_certificate(
+            certificate_request=self._certificate_request
+        )
+
+    @cached_property
+    def k8s_service_is_created(self) -> bool:
+        """Return whether the external LoadBalancer service exists."""
+        return self._k8s_service.is_created()
+
+    @cached_property
+    def load_balancer_ip(self) -> Optional[str]:
+        """Return the IP assigned to the external LoadBalancer service."""
+        return self._k8s_service.get_ip()
+
+    @cached_property
+    def load_balancer_hostname(self) -> Optional[str]:
+        """Return the hostname assigned to the external LoadBalancer service."""
+        return self._k8s_service.get_hostname()
+
+    @cached_property
+    def workload_version(self) -> str:
+        """Return the content of the workload version file, or an empty string."""
+        if not self.exists(self._workload_version_path):
+            return ""
+        return self._container.pull(path=self._workload_version_path).read()
+
+    @cached_property
+    def service_is_running(self) -> bool:
+        """Return whether the AMF service is running."""
+        if not self.can_connect:
+            logger.debug("Cannot connect to container")
+            return False
+        try:
+            service = self._container.get_service(self._service_name)
+        except ModelError:
+            logger.debug("Service %s not found", self._service_name)
+            return False
+        return service.is_running()
+
+    def exists(self, path: str) -> bool:
+        """Return whether a path exists in the workload container.
+
+        Args:
+            path (str): Path in the workload container.
+
+        Returns:
+            bool: Whether the path exists.
+        """
+        if path not in self._path_exists:
+            self._path_exists[path] = self._container.exists(path=path)
+        return self._path_exists[path]
+
+    def read(self, path: str) -> Optional[str]:
+        """Return the content of a file in the workload container.
+
+        Args:
+            path (str): Path in the workload container.
+
+        Returns:
+            str/None: The file content, or None if it cannot be read.
+        """
+        if path not in self._file_contents:
+            content = None
+            if self.can_connect:
+                try:
+                    content = self._container.pull(path=path).read()
+                except (APIError, PathError):
+                    logger.debug("Could not read %s", path)
+            self._file_contents[path] = content
+        return self._file_contents[path]
+
+    def record_path_exists(self, path: str, exists: bool) -> None:
+        """Record that a path was written to or removed from the workload container.
+
+        Args:
+            path (str): Path in the workload container.
+            exists (bool): Whether the path exists after the change.
+        """
+        self._path_exists[path] = exists
+        self._file_contents.pop(path, None)
+
+    def record_k8s_service_created(self) -> None:
+        """Record that the external LoadBalancer service was created."""
+        self.k8s_service_is_created = True
+        self.__dict__.pop("load_balancer_ip", None)
+        self.__dict__.pop("load_balancer_hostname", None)
+
+    def invalidate_service_status(self) -> None:
+        """Forget the AMF service status after the services were changed."""
+        self.__dict__.pop("service_is_running", None)
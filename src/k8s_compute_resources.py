@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""K8sComputeResources class to manage the AMF workload container resources."""
+
+import logging
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from lightkube.core.client import Client
+from lightkube.core.exceptions import ApiError
+from lightkube.models.core_v1 import Container, ResourceRequirements
+from lightkube.resources.apps_v1 import StatefulSet
+from lightkube.resources.core_v1 import Pod
+from lightkube.utils.quantity import parse_quantity
+
+logger = logging.getLogger(__name__)
+
+
+class K8sComputeResources:
+    """K8sComputeResources class to manage the AMF workload container resources.
+
+    The resources are patched onto the application StatefulSet, which makes Kubernetes
+    roll the pods. The pod of the unit then reflects the new resources once it was
+    recreated. Only the managed resources are compared and patched, and managed
+    resources that are no longer desired are removed from the container.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        statefulset_name: str,
+        pod_name: str,
+        container_name: str,
+        field_manager: str,
+        managed_resources: Iterable[str],
+    ):
+        self.namespace = namespace
+        self.statefulset_name = statefulset_name
+        self.pod_name = pod_name
+        self.container_name = container_name
+        self.field_manager = field_manager
+        self.managed_resources = list(managed_resources)
+        self._client: Optional[Client] = None
+
+    @property
+    def client(self) -> Client:
+        """Return the lightkube client, creating it on first use."""
+        if self._client is None:
+            self._client = Client()
+        return self._client
+
+    def statefulset_is_patched(self, resources: ResourceRequirements) -> bool:
+        """Return whether the StatefulSet pod template has the given container resources.
+
+        Args:
+            resources (ResourceRequirements): Desired container resources.
+
+        Returns:
+            bool: Whether the StatefulSet already requests the given resources.
+        """
+        try:
+            statefulset = self.client.get(
+                StatefulSet, name=self.statefulset_name, namespace=self.namespace
+            )
+        except ApiError:
+            return False
+        if not statefulset.spec:
+            return False
+        container = self._get_container(statefulset.spec.template.spec.containers)  # type: ignore[union-attr]
+        return bool(container) and self._resources_match(
+            container.resources, resources  # type: ignore[union-attr]
+        )
+
+    def pod_is_patched(self, resources: ResourceRequirements) -> bool:
+        """Return whether the unit pod runs with the given container resources.
+
+        Args:
+            resources (ResourceRequirements): Desired container resources.
+
+        Returns:
+            bool: Whether the pod was recreated with the given resources.
+        """
+        try:
+            pod = self.client.get(Pod, name=self.pod_name, namespace=self.namespace)
+        except ApiError:
+            return False
+        if not pod.spec:
+            return False
+        container = self._get_container(pod.spec.containers)
+        # Kubernetes defaults the pod requests to the limits when they are not set.
+        expected = ResourceRequirements(
+            limits=resources.limits,
+            requests={**(resources.limits or {}), **(resources.requests or {})},
+        )
+        return bool(container) and self._resources_match(
+            container.resources, expected  # type: ignore[union-attr]
+        )
+
+    def patch(self, resources: ResourceRequirements) -> None:
+        """Patch the container resources onto the StatefulSet pod template.
+
+        Args:
+            resources (ResourceRequirements): Desired container resources. Managed
+                resources missing from the limits or requests are removed from the
+                container, since a strategic merge patch only drops keys set to null.
+        """
+        self.client.patch(
+            StatefulSet,
+            name=self.statefulset_name,
+            namespace=self.namespace,
+            obj={
+                "spec": {
+                    "template": {
+                        "spec": {
+                            "containers": [
+                                {
+                                    "name": self.container_name,
+                                    "resources": {
+                                        "limits": self._managed(resources.limits),
+                                        "requests": self._managed(resources.requests),
+                                    },
+                                }
+                            ]
+                        }
+                    }
+                }
+            },
+            field_manager=self.field_manager,
+        )
+        logger.info("Patched resources of container %s: %s", self.container_name, resources)
+
+    def _get_container(self, containers: list[Container]) -> Optional[Container]:
+        for container in containers:
+            if container.name == self.container_name:
+                return container
+        return None
+
+    def _managed(self, quantities: Optional[Dict[str, str]]) -> Dict[str, Optional[str]]:
+        """Return the quantity of every managed resource, None for the ones not set."""
+        return {name: (quantities or {}).get(name) for name in self.managed_resources}
+
+    def _normalize(self, quantities: Optional[Dict[str, str]]) -> Dict[str, Optional[Decimal]]:
+        return {
+            name: parse_quantity(value)
+            for name, value in self._managed(quantities).items()
+            if value is not None
+        }
+
+    def _resources_match(
+        self, actual: Optional[ResourceRequirements], desired: ResourceRequirements
+    ) -> bool:
+        actual = actual or ResourceRequirements()
+        return self._normalize(actual.limits) == self._normalize(
+            desired.limits
+        ) and self._normalize(actual.requests) == self._normalize(desired.requests)
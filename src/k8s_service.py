@@ -11,13 +11,20 @@ from lightkube.core.client import Client
 from lightkube.core.exceptions import ApiError
 from lightkube.models.core_v1 import ServicePort, ServiceSpec
 from lightkube.models.meta_v1 import ObjectMeta
-from lightkube.resources.core_v1 import Service
+from lightkube.resources.core_v1 import Pod, Service
 
 logger = logging.getLogger(__name__)
 
+ACTIVE_POD_LABEL = "sdcore.canonical.com/amf-active"
+
 
 class K8sService:
-    """K8sService class to manage external AMF service."""
+    """K8sService class to manage external AMF service.
+
+    The lightkube client is only created when the Kubernetes API is first used and the
+    Service object is fetched at most once, so that all the getters called during a
+    hook share a single API request.
+    """
 
     def __init__(
         self,
@@ -32,7 +39,37 @@ class K8sService:
         self.service_port = service_port
         self.app_name = app_name
         self.unit_id = unit_id
-        self.client = Client()
+        self._client: Optional[Client] = None
+        self._service: Optional[Service] = None
+        self._service_fetched = False
+
+    @property
+    def client(self) -> Client:
+        """Return the lightkube client, creating it on first use."""
+        if self._client is None:
+            self._client = Client()
+        return self._client
+
+    def _get_service(self) -> Optional[Service]:
+        """Return the external AMF service, fetching it on first use.
+
+        Returns:
+            Service/None: The external AMF service, or None if it does not exist.
+        """
+        if not self._service_fetched:
+            try:
+                self._service = self.client.get(
+                    Service, name=self.service_name, namespace=self.namespace
+                )
+            except ApiError:
+                self._service = None
+            self._service_fetched = True
+        return self._service
+
+    def _forget_service(self) -> None:
+        """Forget the fetched external AMF service after it was changed."""
+        self._service = None
+        self._service_fetched = False
 
     def create(self) -> None:
         """Create the external AMF service."""
@@ -45,7 +82,10 @@ class K8sService:
                     name=self.service_name,
                 ),
                 spec=ServiceSpec(
-                    selector={"app.kubernetes.io/name": self.app_name},
+                    selector={
+                        "app.kubernetes.io/name": self.app_name,
+                        ACTIVE_POD_LABEL: "true",
+                    },
                     ports=[
                         ServicePort(name="ngapp", port=self.service_port, protocol="SCTP"),
                     ],
@@ -54,33 +94,68 @@ class K8sService:
             ),
             field_manager=self.app_name,
         )
+        self._forget_service()
         logger.info("Created/asserted existence of external AMF service")
 
+    def set_active_pod(self) -> None:
+        """Label this unit's pod as the only one selected by the external AMF service.
+
+        The label is removed from any other pod of the application, so that NGAP
+        associations only reach the unit running the AMF workload. Pods that already
+        have the right label are not patched. Kubernetes API errors, e.g. while the pod
+        is being recreated, are logged and the labels are fixed on the next reconcile.
+        """
+        pod_name = f"{self.app_name}-{self.unit_id}"
+        try:
+            active_pods = self.client.list(
+                Pod,
+                namespace=self.namespace,
+                labels={"app.kubernetes.io/name": self.app_name, ACTIVE_POD_LABEL: "true"},
+            )
+            active_pod_names = {
+                pod.metadata.name for pod in active_pods if pod.metadata and pod.metadata.name
+            }
+            for other_pod_name in sorted(active_pod_names - {pod_name}):
+                self.client.patch(
+                    Pod,
+                    name=other_pod_name,
+                    namespace=self.namespace,
+                    obj={"metadata": {"labels": {ACTIVE_POD_LABEL: None}}},
+                )
+                logger.info("Removed active label from pod %s", other_pod_name)
+            if pod_name in active_pod_names:
+                return
+            self.client.patch(
+                Pod,
+                name=pod_name,
+                namespace=self.namespace,
+                obj={"metadata": {"labels": {ACTIVE_POD_LABEL: "true"}}},
+            )
+            logger.info("Labelled pod %s as the active AMF", pod_name)
+        except ApiError as e:
+            logger.warning("Could not label pod %s as the active AMF: %s", pod_name, e)
+
     def is_created(self) -> bool:
         """Check if the external AMF service is created."""
         try:
-            self.client.get(Service, name=self.service_name, namespace=self.namespace)
-            return True
+            return self._get_service() is not None
         except Exception:
             return False
 
     def remove(self):
         """Remove the external AMF service."""
-        client = Client()
-        client.delete(
+        self.client.delete(
             Service,
             namespace=self.namespace,
             name=self.service_name,
         )
+        self._forget_service()
         logger.info("Removed external AMF service")
 
     def get_ip(self) -> Optional[str]:
         """Return the external service IP."""
-        try:
-            service = self.client.get(Service, name=self.service_name, namespace=self.namespace)
-        except ApiError:
-            return None
-        if not service.status:
+        service = self._get_service()
+        if not service or not service.status:
             return None
         if not service.status.loadBalancer:
             return None
@@ -90,11 +165,8 @@ class K8sService:
 
     def get_hostname(self) -> Optional[str]:
         """Return the external service hostname."""
-        try:
-            service = self.client.get(Service, name=self.service_name, namespace=self.namespace)
-        except ApiError:
-            return None
-        if not service.status:
+        service = self._get_service()
+        if not service or not service.status:
             return None
         if not service.status.loadBalancer:
             return None
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Watch the external AMF service and notify the charm once it gets an address.
+
+The charm starts this script as a detached process when the external LoadBalancer
+Service has no address yet. It watches the Service for a bounded amount of time and,
+as soon as an ingress IP or hostname is assigned, records a Pebble custom notice in the
+workload container. Juju turns that notice into an `amf-pebble-custom-notice` event,
+which lets the charm publish the N2 information without waiting for `update-status`.
+"""
+
+import argparse
+import logging
+import signal
+from typing import List, Optional
+
+from lightkube.core.client import Client
+from lightkube.resources.core_v1 import Service
+from ops import pebble
+
+logger = logging.getLogger(__name__)
+
+
+def service_has_address(service: Service) -> bool:
+    """Return whether the LoadBalancer Service has an ingress IP or hostname.
+
+    Args:
+        service (Service): Kubernetes Service.
+
+    Returns:
+        bool: Whether an ingress IP or hostname is assigned.
+    """
+    if not service.status or not service.status.loadBalancer:
+        return False
+    return any(
+        ingress.ip or ingress.hostname for ingress in service.status.loadBalancer.ingress or []
+    )
+
+
+def wait_for_address(client: Client, namespace: str, service_name: str) -> bool:
+    """Block until the Service has an ingress IP or hostname.
+
+    Args:
+        client (Client): lightkube client.
+        namespace (str): Namespace of the Service.
+        service_name (str): Name of the Service.
+
+    Returns:
+        bool: True once an address is assigned, False if the watch ended before that.
+    """
+    for _, service in client.watch(
+        Service,
+        namespace=namespace,
+        fields={"metadata.name": service_name},
+    ):
+        if service_has_address(service):
+            return True
+    return False
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Wait for the LoadBalancer address and record a Pebble custom notice.
+
+    Args:
+        argv (list): Command line arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--namespace", required=True)
+    parser.add_argument("--service-name", required=True)
+    parser.add_argument("--pebble-socket", required=True)
+    parser.add_argument("--notice-key", required=True)
+    parser.add_argument("--timeout", type=int, required=True)
+    args = parser.parse_args(argv)
+
+    # The default SIGALRM action terminates the process, which bounds the watch.
+    signal.alarm(args.timeout)
+    if not wait_for_address(Client(), namespace=args.namespace, service_name=args.service_name):
+        return
+    pebble.Client(socket_path=args.pebble_socket).notify(pebble.NoticeType.CUSTOM, args.notice_key)
+    logger.info("LoadBalancer address assigned to %s", args.service_name)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
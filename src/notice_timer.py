@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""Record a Pebble custom notice in the workload container after a delay.
+
+The charm starts this script as a detached process when it postpones an AMF restart
+until the end of the restart coalescing window. Once the delay elapsed, the script
+records a Pebble custom notice, which Juju turns into an `amf-pebble-custom-notice`
+event so that the charm runs the pending restart.
+"""
+
+import argparse
+import logging
+import time
+from typing import List, Optional
+
+from ops import pebble
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Wait for the given delay and record a Pebble custom notice.
+
+    Args:
+        argv (list): Command line arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pebble-socket", required=True)
+    parser.add_argument("--notice-key", required=True)
+    parser.add_argument("--delay", type=int, required=True)
+    args = parser.parse_args(argv)
+
+    time.sleep(args.delay)
+    pebble.Client(socket_path=args.pebble_socket).notify(pebble.NoticeType.CUSTOM, args.notice_key)
+    logger.info("Recorded notice %s after %d seconds", args.notice_key, args.delay)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -12,6 +12,7 @@ output "requires" {
     sdcore_config = "sdcore_config"
     certificates  = "certificates"
     logging       = "logging"
+    database      = "database"
   }
 }
 
@@ -36,6 +36,7 @@ async def deploy(ops_test: OpsTest, request):
     charm = Path(request.config.getoption("--charm_path")).resolve()
     resources = {
         "amf-image": METADATA["resources"]["amf-image"]["upstream-source"],
+        "sctplb-image": METADATA["resources"]["sctplb-image"]["upstream-source"],
     }
     await ops_test.model.deploy(
         charm,
@@ -67,6 +68,7 @@ async def test_relate_and_wait_for_active_status(ops_test: OpsTest, deploy):
     await ops_test.model.integrate(relation1=APP_NAME, relation2=NRF_CHARM_NAME)
     await ops_test.model.integrate(relation1=APP_NAME, relation2=NMS_CHARM_NAME)
     await ops_test.model.integrate(relation1=APP_NAME, relation2=TLS_PROVIDER_CHARM_NAME)
+    await ops_test.model.integrate(relation1=f"{APP_NAME}:database", relation2=DB_CHARM_NAME)
     await ops_test.model.integrate(
         relation1=f"{APP_NAME}:logging", relation2=f"{GRAFANA_AGENT_CHARM_NAME}:logging-provider"
     )
@@ -7,12 +7,17 @@ import pytest
 from ops import testing
 
 from charm import AMFOperatorCharm
+from k8s_compute_resources import K8sComputeResources
 from k8s_service import K8sService
 
 
 class AMFUnitTestFixtures:
     patcher_k8s_service = patch("charm.K8sService", autospec=K8sService)
+    patcher_k8s_compute_resources = patch(
+        "charm.K8sComputeResources", autospec=K8sComputeResources
+    )
     patcher_check_output = patch("charm.check_output")
+    patcher_popen = patch("charm.Popen")
     patcher_nrf_url = patch(
         "charms.sdcore_nrf_k8s.v0.fiveg_nrf.NRFRequires.nrf_url", new_callable=PropertyMock
     )
@@ -28,12 +33,17 @@ class AMFUnitTestFixtures:
     @pytest.fixture(autouse=True)
     def setup(self, request):
         self.mock_k8s_service = AMFUnitTestFixtures.patcher_k8s_service.start().return_value
+        self.mock_k8s_compute_resources = (
+            AMFUnitTestFixtures.patcher_k8s_compute_resources.start().return_value
+        )
         self.mock_get_assigned_certificate = (
             AMFUnitTestFixtures.patcher_get_assigned_certificate.start()
         )
         self.mock_nrf_url = AMFUnitTestFixtures.patcher_nrf_url.start()
         self.mock_webui_url = AMFUnitTestFixtures.patcher_webui_url.start()
         self.mock_check_output = AMFUnitTestFixtures.patcher_check_output.start()
+        self.mock_popen = AMFUnitTestFixtures.patcher_popen.start()
+        self.mock_popen.return_value.pid = 1234
 
         self.mock_stop = (
             AMFUnitTestFixtures.patcher_stop.start()
@@ -1,12 +1,18 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import logging
+import time
+from unittest.mock import patch
 
 import pytest
 from ops import ActionEvent, CharmBase, testing
+from ops.model import RelationDataContent
 
 from lib.charms.sdcore_amf_k8s.v0.fiveg_n2 import N2Provides
 
+logger = logging.getLogger(__name__)
+
 
 class DummyFivegN2ProviderCharm(CharmBase):
     """Dummy charm implementing the provider side of the fiveg_n2 interface."""
@@ -22,6 +28,7 @@ class DummyFivegN2ProviderCharm(CharmBase):
         ip_address = event.params.get("ip-address")
         hostname = event.params.get("hostname")
         port = event.params.get("port")
+        ip_addresses = event.params.get("ip-addresses")
         assert ip_address
         assert hostname
         assert port
@@ -29,6 +36,7 @@ class DummyFivegN2ProviderCharm(CharmBase):
             amf_ip_address=ip_address,
             amf_hostname=hostname,
             amf_port=port,
+            amf_ip_addresses=ip_addresses.split(",") if ip_addresses else None,
         )
 
 
@@ -47,6 +55,7 @@ class TestFiveGN2Provider:
                         "ip-address": {"type": "string"},
                         "hostname": {"type": "string"},
                         "port": {"type": "string"},
+                        "ip-addresses": {"type": "string"},
                     },
                 },
             },
@@ -77,6 +86,81 @@ class TestFiveGN2Provider:
         assert relation.local_app_data["amf_hostname"] == "amf"
         assert relation.local_app_data["amf_port"] == "38412"
 
+    def test_given_unit_is_leader_and_multiple_ip_addresses_when_set_fiveg_n2_information_then_ip_addresses_are_in_application_databag(  # noqa: E501
+        self,
+    ):
+        fiveg_n2_relation = testing.Relation(
+            endpoint="fiveg-n2",
+            interface="fiveg_n2",
+        )
+        state_in = testing.State(
+            leader=True,
+            relations={fiveg_n2_relation},
+        )
+
+        params={
+            "ip-address": "192.0.2.1",
+            "hostname": "amf",
+            "port": "38412",
+            "ip-addresses": "192.0.2.1,198.51.100.1",
+        }
+
+        state_out = self.ctx.run(self.ctx.on.action("set-n2-information", params=params), state_in)
+
+        relation = state_out.get_relation(fiveg_n2_relation.id)
+        assert relation.local_app_data["amf_ip_addresses"] == "192.0.2.1,198.51.100.1"
+
+    def test_given_hundreds_of_relations_with_up_to_date_data_when_set_fiveg_n2_information_then_only_outdated_relation_is_written(  # noqa: E501
+        self,
+    ):
+        up_to_date_relations = [
+            testing.Relation(
+                endpoint="fiveg-n2",
+                interface="fiveg_n2",
+                local_app_data={
+                    "amf_ip_address": "192.0.2.1",
+                    "amf_hostname": "amf",
+                    "amf_port": "38412",
+                },
+            )
+            for _ in range(299)
+        ]
+        outdated_relation = testing.Relation(endpoint="fiveg-n2", interface="fiveg_n2")
+        state_in = testing.State(
+            leader=True,
+            relations={*up_to_date_relations, outdated_relation},
+        )
+        params={
+            "ip-address": "192.0.2.1",
+            "hostname": "amf",
+            "port": "38412",
+        }
+
+        with patch.object(
+            RelationDataContent,
+            "_commit",
+            autospec=True,
+            side_effect=RelationDataContent._commit,
+        ) as mock_relation_set:
+            start = time.perf_counter()
+            state_out = self.ctx.run(
+                self.ctx.on.action("set-n2-information", params=params), state_in
+            )
+            elapsed = time.perf_counter() - start
+
+        logger.info(
+            "set_n2_information over %s relations: %.2f ms, %s relation-set calls",
+            len(up_to_date_relations) + 1,
+            elapsed * 1000,
+            mock_relation_set.call_count,
+        )
+        mock_relation_set.assert_called_once()
+        assert state_out.get_relation(outdated_relation.id).local_app_data == {
+            "amf_ip_address": "192.0.2.1",
+            "amf_hostname": "amf",
+            "amf_port": "38412",
+        }
+
     def test_given_unit_is_not_leader_when_fiveg_n2_relation_joined_then_data_is_not_in_application_databag(  # noqa: E501
         self,
     ):
@@ -1,11 +1,17 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+from unittest.mock import patch
 
 import pytest
 from ops import ActionEvent, CharmBase, testing
 
-from lib.charms.sdcore_amf_k8s.v0.fiveg_n2 import N2InformationAvailableEvent, N2Requires
+from lib.charms.sdcore_amf_k8s.v0 import fiveg_n2
+from lib.charms.sdcore_amf_k8s.v0.fiveg_n2 import (
+    N2Information,
+    N2InformationAvailableEvent,
+    N2Requires,
+)
 
 
 class DummyFivegN2Requires(CharmBase):
@@ -67,6 +73,33 @@ class TestFiveGNRFRequirer:
         assert self.ctx.emitted_events[1].amf_hostname == "amf"
         assert self.ctx.emitted_events[1].amf_port == "38412"
 
+    def test_given_multiple_ip_addresses_in_relation_data_when_relation_changed_then_n2_information_available_event_carries_them(  # noqa: E501
+        self,
+    ):
+        fiveg_n2_relation = testing.Relation(
+            endpoint="fiveg-n2",
+            interface="fiveg_n2",
+            remote_app_data={
+                "amf_ip_address": "192.168.70.132",
+                "amf_hostname": "amf",
+                "amf_port": "38412",
+                "amf_ip_addresses": "192.168.70.132,192.168.80.132",
+            },
+        )
+        state_in = testing.State(
+            leader=True,
+            relations={fiveg_n2_relation},
+        )
+
+        self.ctx.run(self.ctx.on.relation_changed(fiveg_n2_relation), state_in)
+
+        event = self.ctx.emitted_events[1]
+        assert isinstance(event, N2InformationAvailableEvent)
+        assert event.amf_ip_addresses == [
+            "192.168.70.132",
+            "192.168.80.132",
+        ]
+
     def test_given_n2_information_not_in_relation_data_when_relation_changed_then_n2_information_available_event_is_not_emitted(  # noqa: E501
         self,
     ):
@@ -129,3 +162,35 @@ class TestFiveGNRFRequirer:
             "amf-hostname": "amf",
             "amf-port": "38412",
         }
+
+    def test_given_n2_information_in_relation_data_when_every_field_is_read_then_relation_data_is_validated_once(  # noqa: E501
+        self,
+    ):
+        fiveg_n2_relation = testing.Relation(
+            endpoint="fiveg-n2",
+            interface="fiveg_n2",
+            remote_app_data={
+                "amf_ip_address": "1.2.3.4",
+                "amf_hostname": "amf",
+                "amf_port": "38412",
+            },
+        )
+        state_in = testing.State(
+            leader=True,
+            relations={fiveg_n2_relation},
+        )
+
+        with patch.object(
+            fiveg_n2, "_parse_n2_information", wraps=fiveg_n2._parse_n2_information
+        ) as mock_parse:
+            with self.ctx(self.ctx.on.action("get-n2-information"), state_in) as manager:
+                manager.run()
+                n2_information = manager.charm.n2_requirer.n2_information
+
+        mock_parse.assert_called_once()
+        assert n2_information == N2Information(
+            amf_ip_address="1.2.3.4",
+            amf_hostname="amf",
+            amf_port=38412,
+            amf_ip_addresses=("1.2.3.4",),
+        )
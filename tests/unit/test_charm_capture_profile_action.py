@@ -0,0 +1,100 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import os
+import tempfile
+import time
+import urllib.error
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ops import testing
+from ops.pebble import Layer, ServiceStatus
+
+from tests.unit.fixtures import AMFUnitTestFixtures
+
+
+def _running_amf_container(profiles_dir: str) -> testing.Container:
+    return testing.Container(
+        name="amf",
+        can_connect=True,
+        layers={"amf": Layer({"services": {"amf": {}}})},
+        service_statuses={"amf": ServiceStatus.ACTIVE},
+        mounts={"profiles": testing.Mount(location="/var/lib/amf/profiles", source=profiles_dir)},
+    )
+
+
+class TestCharmCaptureProfileAction(AMFUnitTestFixtures):
+    @pytest.fixture(autouse=True)
+    def setup_urlopen(self):
+        with patch("charm.urllib.request.urlopen") as self.mock_urlopen:
+            response = MagicMock()
+            response.read.return_value = b"pprof"
+            self.mock_urlopen.return_value.__enter__.return_value = response
+            yield
+
+    def test_given_amf_running_when_capture_profile_action_then_path_and_size_are_returned(
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as profiles_dir:
+            state_in = testing.State(containers={_running_amf_container(profiles_dir)})
+
+            with patch("charm.time.gmtime", return_value=time.gmtime(0)):
+                self.ctx.run(
+                    self.ctx.on.action("capture-profile", params={"duration": 10}), state_in
+                )
+
+            assert self.ctx.action_results == {
+                "path": "/var/lib/amf/profiles/profile-19700101T000000Z.pb.gz",
+                "size": 5,
+            }
+            assert self.mock_urlopen.call_args.args[0] == (
+                "http://127.0.0.1:5001/debug/pprof/profile?seconds=10"
+            )
+            with open(f"{profiles_dir}/profile-19700101T000000Z.pb.gz", "rb") as f:
+                assert f.read() == b"pprof"
+
+    def test_given_more_profiles_than_retention_limit_when_capture_heap_action_then_oldest_profiles_are_removed(  # noqa: E501
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as profiles_dir:
+            for day in range(1, 7):
+                with open(f"{profiles_dir}/heap-197001{day:02d}T000000Z.pb.gz", "wb") as f:
+                    f.write(b"pprof")
+            with open(f"{profiles_dir}/profile-19700101T000000Z.pb.gz", "wb") as f:
+                f.write(b"pprof")
+            state_in = testing.State(containers={_running_amf_container(profiles_dir)})
+
+            with patch("charm.time.gmtime", return_value=time.gmtime(6 * 86400)):
+                self.ctx.run(self.ctx.on.action("capture-heap"), state_in)
+
+            assert sorted(os.listdir(profiles_dir)) == [
+                "heap-19700103T000000Z.pb.gz",
+                "heap-19700104T000000Z.pb.gz",
+                "heap-19700105T000000Z.pb.gz",
+                "heap-19700106T000000Z.pb.gz",
+                "heap-19700107T000000Z.pb.gz",
+                "profile-19700101T000000Z.pb.gz",
+            ]
+
+    def test_given_pprof_endpoint_unreachable_when_capture_profile_action_then_action_fails(
+        self,
+    ):
+        self.mock_urlopen.side_effect = urllib.error.URLError("Connection refused")
+        with tempfile.TemporaryDirectory() as profiles_dir:
+            state_in = testing.State(containers={_running_amf_container(profiles_dir)})
+
+            with pytest.raises(testing.ActionFailed) as e:
+                self.ctx.run(
+                    self.ctx.on.action("capture-profile", params={"duration": 10}), state_in
+                )
+
+            assert e.value.message.startswith("Failed to capture profile profile")
+
+    def test_given_amf_not_running_when_capture_heap_action_then_action_fails(self):
+        state_in = testing.State(containers={testing.Container(name="amf", can_connect=True)})
+
+        with pytest.raises(testing.ActionFailed) as e:
+            self.ctx.run(self.ctx.on.action("capture-heap"), state_in)
+
+        assert e.value.message == "AMF service is not running"
@@ -172,3 +172,31 @@ class TestCharmFiveGN2RelationJoined(AMFUnitTestFixtures):
             "amf_hostname": f"sdcore-amf-k8s-external.{model_name}.svc.cluster.local",
             "amf_port": "38412",
         }
+
+    def test_given_ngap_ip_addresses_config_and_service_is_running_when_fiveg_n2_relation_joined_then_every_address_is_in_relation_databag(  # noqa: E501
+        self,
+    ):
+        fiveg_n2_relation = testing.Relation(endpoint="fiveg-n2", interface="fiveg-n2")
+        container = testing.Container(
+            name="amf",
+            can_connect=True,
+            layers={"amf": Layer({"services": {"amf": {}}})},
+            service_statuses={"amf": ServiceStatus.ACTIVE},
+        )
+        state_in = testing.State(
+            config={"ngap-ip-addresses": "192.0.2.10, 198.51.100.10"},
+            leader=True,
+            containers={container},
+            relations={fiveg_n2_relation},
+        )
+        self.mock_k8s_service.get_hostname.return_value = "amf.pizza.example.com"
+        self.mock_k8s_service.get_ip.return_value = "192.0.2.1"
+
+        state_out = self.ctx.run(self.ctx.on.relation_joined(fiveg_n2_relation), state_in)
+
+        assert state_out.get_relation(fiveg_n2_relation.id).local_app_data == {
+            "amf_ip_address": "192.0.2.10",
+            "amf_ip_addresses": "192.0.2.10,198.51.100.10",
+            "amf_hostname": "amf.pizza.example.com",
+            "amf_port": "38412",
+        }
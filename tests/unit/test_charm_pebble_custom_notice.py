@@ -0,0 +1,146 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import tempfile
+from unittest.mock import patch
+
+from ops import Container, testing
+from ops.pebble import Layer, ServiceStatus
+
+from tests.unit.certificates_helpers import (
+    example_cert_and_key,
+)
+from tests.unit.fixtures import AMFUnitTestFixtures
+
+LOAD_BALANCER_NOTICE_KEY = "canonical.com/sdcore-amf-k8s/load-balancer-address"
+RESTART_NOTICE_KEY = "canonical.com/sdcore-amf-k8s/restart"
+
+
+class TestCharmPebbleCustomNotice(AMFUnitTestFixtures):
+    def test_given_load_balancer_address_notice_when_pebble_custom_notice_then_n2_information_is_in_relation_databag(  # noqa: E501
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as tempdir:
+            nrf_relation = testing.Relation(endpoint="fiveg_nrf", interface="fiveg_nrf")
+            certificates_relation = testing.Relation(
+                endpoint="certificates", interface="tls-certificates"
+            )
+            sdcore_config_relation = testing.Relation(
+                endpoint="sdcore_config", interface="sdcore_config"
+            )
+            fiveg_n2_relation = testing.Relation(endpoint="fiveg-n2", interface="fiveg-n2")
+            certs_mount = testing.Mount(
+                location="/support/TLS",
+                source=tempdir,
+            )
+            config_mount = testing.Mount(
+                location="/free5gc/config",
+                source=tempdir,
+            )
+            notice = testing.Notice(key=LOAD_BALANCER_NOTICE_KEY)
+            container = testing.Container(
+                name="amf",
+                can_connect=True,
+                mounts={"certs": certs_mount, "config": config_mount},
+                notices=[notice],
+            )
+            state_in = testing.State(
+                leader=True,
+                containers={container},
+                relations={
+                    nrf_relation,
+                    certificates_relation,
+                    sdcore_config_relation,
+                    fiveg_n2_relation,
+                },
+            )
+            provider_certificate, private_key = example_cert_and_key(
+                tls_relation_id=certificates_relation.id
+            )
+            self.mock_get_assigned_certificate.return_value = provider_certificate, private_key
+            self.mock_check_output.return_value = b"192.0.2.1"
+            self.mock_k8s_service.get_ip.return_value = "192.0.2.1"
+            self.mock_k8s_service.get_hostname.return_value = "amf.pizza.example.com"
+            self.mock_nrf_url.return_value = "http://nrf:8081"
+            self.mock_webui_url.return_value = "sdcore-webui:9876"
+
+            state_out = self.ctx.run(
+                self.ctx.on.pebble_custom_notice(container=container, notice=notice), state_in
+            )
+
+            assert state_out.get_relation(fiveg_n2_relation.id).local_app_data == {
+                "amf_ip_address": "192.0.2.1",
+                "amf_hostname": "amf.pizza.example.com",
+                "amf_port": "38412",
+            }
+
+    def test_given_unknown_notice_when_pebble_custom_notice_then_n2_information_is_not_in_relation_databag(  # noqa: E501
+        self,
+    ):
+        fiveg_n2_relation = testing.Relation(endpoint="fiveg-n2", interface="fiveg-n2")
+        notice = testing.Notice(key="example.com/unknown")
+        container = testing.Container(name="amf", can_connect=True, notices=[notice])
+        state_in = testing.State(
+            leader=True,
+            containers={container},
+            relations={fiveg_n2_relation},
+        )
+        self.mock_k8s_service.get_ip.return_value = "192.0.2.1"
+        self.mock_k8s_service.get_hostname.return_value = "amf.pizza.example.com"
+
+        state_out = self.ctx.run(
+            self.ctx.on.pebble_custom_notice(container=container, notice=notice), state_in
+        )
+
+        assert state_out.get_relation(fiveg_n2_relation.id).local_app_data == {}
+
+    def test_given_restart_pending_when_restart_notice_then_amf_is_restarted_and_restart_is_recorded(  # noqa: E501
+        self,
+    ):
+        replicas_relation = testing.PeerRelation(endpoint="replicas", interface="amf-replica")
+        notice = testing.Notice(key=RESTART_NOTICE_KEY)
+        container = testing.Container(
+            name="amf",
+            can_connect=True,
+            layers={"amf": Layer({"services": {"amf": {}}})},
+            service_statuses={"amf": ServiceStatus.ACTIVE},
+            notices=[notice],
+        )
+        state_in = testing.State(
+            containers={container},
+            relations={replicas_relation},
+            stored_states={
+                testing.StoredState(
+                    owner_path="AMFOperatorCharm",
+                    content={"restart_pending": True, "restart_count": 4},
+                )
+            },
+        )
+
+        with patch.object(Container, "restart", autospec=True) as restart:
+            state_out = self.ctx.run(
+                self.ctx.on.pebble_custom_notice(container=container, notice=notice), state_in
+            )
+
+        restart.assert_called_once()
+        restart_stats = state_out.get_relation(replicas_relation.id).local_unit_data
+        assert restart_stats["restart-count"] == "5"
+        assert "last-restart" in restart_stats
+
+    def test_given_no_restart_pending_when_restart_notice_then_amf_is_not_restarted(self):
+        notice = testing.Notice(key=RESTART_NOTICE_KEY)
+        container = testing.Container(
+            name="amf",
+            can_connect=True,
+            layers={"amf": Layer({"services": {"amf": {}}})},
+            service_statuses={"amf": ServiceStatus.ACTIVE},
+            notices=[notice],
+        )
+        state_in = testing.State(containers={container})
+
+        with patch.object(Container, "restart", autospec=True) as restart:
+            self.ctx.run(
+                self.ctx.on.pebble_custom_notice(container=container, notice=notice), state_in
+            )
+
+        restart.assert_not_called()
@@ -0,0 +1,129 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import logging
+import os
+import tempfile
+import timeit
+from unittest.mock import patch
+
+from jinja2 import Environment, FileSystemLoader
+
+from charm import (
+    CONFIG_TEMPLATE_DIR_PATH,
+    CONFIG_TEMPLATE_NAME,
+    AMFOperatorCharm,
+    _get_template,
+)
+
+logger = logging.getLogger(__name__)
+
+RENDER_ARGUMENTS = {
+    "amf_ip": "192.0.2.1",
+    "ngapp_port": 38412,
+    "sctp_grpc_port": 9000,
+    "sbi_port": 29518,
+    "nrf_url": "http://nrf:8081",
+    "full_network_name": "SDCORE5G",
+    "short_network_name": "SDCORE",
+    "dnns": ["internet"],
+    "ngap_ip_list": ["0.0.0.0"],
+    "scheme": "https",
+    "enable_sctp_lb": False,
+    "enable_nrf_caching": True,
+    "nrf_cache_eviction_interval": 900,
+    "database_url": None,
+    "database_name": "sdcore_amf",
+    "webui_uri": "sdcore-webui:9876",
+    "log_level": "info",
+    "tls_pem": "/support/TLS/amf.pem",
+    "tls_key": "/support/TLS/amf.key",
+}
+
+
+def _render_config_file_uncached() -> str:
+    jinja2_environment = Environment(loader=FileSystemLoader(CONFIG_TEMPLATE_DIR_PATH))
+    template = jinja2_environment.get_template(CONFIG_TEMPLATE_NAME)
+    return template.render(**RENDER_ARGUMENTS)
+
+
+class TestCharmRenderConfig:
+    def test_given_same_arguments_when_render_config_file_then_content_matches_uncached_render(
+        self,
+    ):
+        assert AMFOperatorCharm._render_config_file(
+            **RENDER_ARGUMENTS
+        ) == _render_config_file_uncached()
+
+    def test_given_compiled_template_is_cached_when_render_config_file_then_render_time_is_logged(
+        self,
+    ):
+        AMFOperatorCharm._render_config_file(**RENDER_ARGUMENTS)
+
+        uncached = min(timeit.repeat(_render_config_file_uncached, number=50, repeat=3))
+        cached = min(
+            timeit.repeat(
+                lambda: AMFOperatorCharm._render_config_file(**RENDER_ARGUMENTS),
+                number=50,
+                repeat=3,
+            )
+        )
+
+        logger.info(
+            "Rendering %s 50 times: uncached %.2f ms, cached %.2f ms",
+            CONFIG_TEMPLATE_NAME,
+            uncached * 1000,
+            cached * 1000,
+        )
+
+    def test_given_template_already_loaded_when_get_template_then_same_template_is_returned(
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            _get_template.cache_clear()
+            with patch("charm.JINJA_BYTECODE_CACHE_DIR_PATH", cache_dir):
+                first_template = _get_template(CONFIG_TEMPLATE_NAME)
+                second_template = _get_template(CONFIG_TEMPLATE_NAME)
+            _get_template.cache_clear()
+
+            assert first_template is second_template
+            assert os.listdir(cache_dir)
+
+    def test_given_nrf_caching_disabled_when_render_config_file_then_nrf_cache_settings_are_rendered(  # noqa: E501
+        self,
+    ):
+        content = AMFOperatorCharm._render_config_file(
+            **{
+                **RENDER_ARGUMENTS,
+                "enable_nrf_caching": False,
+                "nrf_cache_eviction_interval": 60,
+            }
+        )
+
+        assert "  enableNrfCaching: false\n  nrfCacheEvictionInterval: 60\n" in content
+
+    def test_given_multiple_dnns_when_render_config_file_then_every_dnn_is_in_support_dnn_list(
+        self,
+    ):
+        content = AMFOperatorCharm._render_config_file(
+            **{**RENDER_ARGUMENTS, "dnns": ["internet", "ims"]}
+        )
+
+        assert "  supportDnnList:\n    - internet\n    - ims\n" in content
+
+    def test_given_multiple_ngap_ip_addresses_when_render_config_file_then_every_address_is_in_ngap_ip_list(  # noqa: E501
+        self,
+    ):
+        content = AMFOperatorCharm._render_config_file(
+            **{**RENDER_ARGUMENTS, "ngap_ip_list": ["192.0.2.10", "198.51.100.10"]}
+        )
+
+        assert "  ngapIpList:\n    - 192.0.2.10\n    - 198.51.100.10\n" in content
+
+    def test_given_http_scheme_when_render_config_file_then_tls_settings_are_not_rendered(
+        self,
+    ):
+        content = AMFOperatorCharm._render_config_file(**{**RENDER_ARGUMENTS, "scheme": "http"})
+
+        assert "    scheme: http\n  sctpGrpcPort: 9000\n" in content
+        assert "tls:" not in content
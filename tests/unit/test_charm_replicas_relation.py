@@ -1,9 +1,16 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
+import dataclasses
+import tempfile
+from unittest.mock import patch
+
 import ops.pebble
-from ops import testing
+from ops import Container, testing
 from ops.pebble import Layer
 
+from tests.unit.certificates_helpers import (
+    example_cert_and_key,
+)
 from tests.unit.fixtures import AMFUnitTestFixtures
 
 
@@ -86,3 +93,170 @@ class TestCharmConfigure(AMFUnitTestFixtures):
         )
         self.ctx.run(self.ctx.on.relation_changed(replicas_relation), state_in)
         self.mock_stop.assert_called_once()
+
+    def test_given_previous_leader_and_amf_starts_when_leader_elected_then_failover_duration_is_in_databag(  # noqa E501
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as tempdir:
+            replicas_relation = testing.PeerRelation(
+                endpoint="replicas",
+                local_app_data={"leader": "sdcore-amf-k8s/1"},
+            )
+            nrf_relation = testing.Relation(endpoint="fiveg_nrf", interface="fiveg_nrf")
+            certificates_relation = testing.Relation(
+                endpoint="certificates", interface="tls-certificates"
+            )
+            sdcore_config_relation = testing.Relation(
+                endpoint="sdcore_config", interface="sdcore_config"
+            )
+            certs_mount = testing.Mount(
+                location="/support/TLS",
+                source=tempdir,
+            )
+            config_mount = testing.Mount(
+                location="/free5gc/config",
+                source=tempdir,
+            )
+            container = testing.Container(
+                name="amf", can_connect=True, mounts={"certs": certs_mount, "config": config_mount}
+            )
+            state_in = testing.State(
+                leader=True,
+                containers={container},
+                relations={
+                    replicas_relation,
+                    nrf_relation,
+                    certificates_relation,
+                    sdcore_config_relation,
+                },
+            )
+            provider_certificate, private_key = example_cert_and_key(
+                tls_relation_id=certificates_relation.id
+            )
+            self.mock_get_assigned_certificate.return_value = provider_certificate, private_key
+            self.mock_check_output.return_value = b"192.0.2.1"
+            self.mock_nrf_url.return_value = "http://nrf:8081"
+            self.mock_webui_url.return_value = "sdcore-webui:9876"
+
+            state_out = self.ctx.run(self.ctx.on.leader_elected(), state_in)
+
+            relation_data = state_out.get_relation(replicas_relation.id).local_app_data
+            assert float(relation_data["failover-duration"]) >= 0
+
+    def test_given_no_previous_leader_when_leader_elected_then_failover_duration_is_not_in_databag(  # noqa E501
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as tempdir:
+            replicas_relation = testing.PeerRelation(
+                endpoint="replicas",
+            )
+            nrf_relation = testing.Relation(endpoint="fiveg_nrf", interface="fiveg_nrf")
+            certificates_relation = testing.Relation(
+                endpoint="certificates", interface="tls-certificates"
+            )
+            sdcore_config_relation = testing.Relation(
+                endpoint="sdcore_config", interface="sdcore_config"
+            )
+            certs_mount = testing.Mount(
+                location="/support/TLS",
+                source=tempdir,
+            )
+            config_mount = testing.Mount(
+                location="/free5gc/config",
+                source=tempdir,
+            )
+            container = testing.Container(
+                name="amf", can_connect=True, mounts={"certs": certs_mount, "config": config_mount}
+            )
+            state_in = testing.State(
+                leader=True,
+                containers={container},
+                relations={
+                    replicas_relation,
+                    nrf_relation,
+                    certificates_relation,
+                    sdcore_config_relation,
+                },
+            )
+            provider_certificate, private_key = example_cert_and_key(
+                tls_relation_id=certificates_relation.id
+            )
+            self.mock_get_assigned_certificate.return_value = provider_certificate, private_key
+            self.mock_check_output.return_value = b"192.0.2.1"
+            self.mock_nrf_url.return_value = "http://nrf:8081"
+            self.mock_webui_url.return_value = "sdcore-webui:9876"
+
+            state_out = self.ctx.run(self.ctx.on.leader_elected(), state_in)
+
+            relation_data = state_out.get_relation(replicas_relation.id).local_app_data
+            assert "failover-duration" not in relation_data
+            assert relation_data["leader"] == "sdcore-amf-k8s/0"
+
+    def test_given_warm_standby_staged_and_previous_leader_when_leader_elected_then_amf_is_started_without_push_or_restart(  # noqa E501
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as tempdir:
+            replicas_relation = testing.PeerRelation(
+                endpoint="replicas",
+                local_app_data={"leader": "sdcore-amf-k8s/1"},
+            )
+            nrf_relation = testing.Relation(endpoint="fiveg_nrf", interface="fiveg_nrf")
+            certificates_relation = testing.Relation(
+                endpoint="certificates", interface="tls-certificates"
+            )
+            sdcore_config_relation = testing.Relation(
+                endpoint="sdcore_config", interface="sdcore_config"
+            )
+            certs_mount = testing.Mount(
+                location="/support/TLS",
+                source=tempdir,
+            )
+            config_mount = testing.Mount(
+                location="/free5gc/config",
+                source=tempdir,
+            )
+            container = testing.Container(
+                name="amf", can_connect=True, mounts={"certs": certs_mount, "config": config_mount}
+            )
+            state_in = testing.State(
+                leader=False,
+                config={"warm-standby": True},
+                containers={container},
+                relations={
+                    replicas_relation,
+                    nrf_relation,
+                    certificates_relation,
+                    sdcore_config_relation,
+                },
+            )
+            provider_certificate, private_key = example_cert_and_key(
+                tls_relation_id=certificates_relation.id
+            )
+            self.mock_get_assigned_certificate.return_value = provider_certificate, private_key
+            self.mock_check_output.return_value = b"192.0.2.1"
+            self.mock_nrf_url.return_value = "http://nrf:8081"
+            self.mock_webui_url.return_value = "sdcore-webui:9876"
+            state_out = self.ctx.run(self.ctx.on.config_changed(), state_in)
+
+            with (
+                patch.object(Container, "push", autospec=True) as mock_push,
+                patch.object(Container, "restart", autospec=True) as mock_restart,
+            ):
+                state_out = self.ctx.run(
+                    self.ctx.on.leader_elected(), dataclasses.replace(state_out, leader=True)
+                )
+
+            mock_push.assert_not_called()
+            mock_restart.assert_not_called()
+            container_out = state_out.get_container("amf")
+            assert container_out.service_statuses["amf"] == ops.pebble.ServiceStatus.ACTIVE
+            relation_data = state_out.get_relation(replicas_relation.id).local_app_data
+            assert float(relation_data["failover-duration"]) >= 0
+            stored_state = next(
+                stored_state
+                for stored_state in state_out.stored_states
+                if stored_state.owner_path == "AMFOperatorCharm"
+            )
+            assert stored_state.content["serving_certificate_expires_at"] == (
+                provider_certificate.certificate.expiry_time.timestamp()
+            )
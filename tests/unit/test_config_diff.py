@@ -0,0 +1,61 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from config_diff import ConfigChange, classify_config_change
+
+CURRENT_CONFIG = """\
+configuration:
+  amfName: AMF
+  enableNrfCaching: true
+  supportDnnList:
+  - internet
+logger:
+  AMF:
+    debugLevel: info
+"""
+
+
+class TestConfigDiff:
+    def test_given_no_current_config_when_classify_then_restart_is_needed(self):
+        assert classify_config_change(None, CURRENT_CONFIG) == ConfigChange.NEEDS_RESTART
+
+    def test_given_only_formatting_changed_when_classify_then_change_is_no_op(self):
+        desired = """\
+logger:
+  AMF: {debugLevel: info}
+configuration:
+  # Same settings, another layout
+  supportDnnList: [internet]
+  enableNrfCaching: true
+  amfName: AMF
+"""
+
+        assert classify_config_change(CURRENT_CONFIG, desired) == ConfigChange.NO_OP
+
+    def test_given_log_level_and_dnn_list_changed_when_classify_then_change_is_hot_reloadable(
+        self,
+    ):
+        desired = CURRENT_CONFIG.replace("debugLevel: info", "debugLevel: debug").replace(
+            "  - internet\n", "  - internet\n  - ims\n"
+        )
+
+        assert classify_config_change(CURRENT_CONFIG, desired) == ConfigChange.HOT_RELOADABLE
+
+    def test_given_hot_reloadable_and_other_setting_changed_when_classify_then_restart_is_needed(
+        self,
+    ):
+        desired = CURRENT_CONFIG.replace("debugLevel: info", "debugLevel: debug").replace(
+            "enableNrfCaching: true", "enableNrfCaching: false"
+        )
+
+        assert classify_config_change(CURRENT_CONFIG, desired) == ConfigChange.NEEDS_RESTART
+
+    def test_given_setting_added_when_classify_then_restart_is_needed(self):
+        desired = CURRENT_CONFIG.replace(
+            "  amfName: AMF\n", "  amfName: AMF\n  enableDBStore: true\n"
+        )
+
+        assert classify_config_change(CURRENT_CONFIG, desired) == ConfigChange.NEEDS_RESTART
+
+    def test_given_unparsable_current_config_when_classify_then_restart_is_needed(self):
+        assert classify_config_change("a: [", CURRENT_CONFIG) == ConfigChange.NEEDS_RESTART
@@ -0,0 +1,151 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import patch
+
+import pytest
+from lightkube.models.apps_v1 import StatefulSetSpec
+from lightkube.models.core_v1 import (
+    Container,
+    PodSpec,
+    PodTemplateSpec,
+    ResourceRequirements,
+)
+from lightkube.models.meta_v1 import LabelSelector
+from lightkube.resources.apps_v1 import StatefulSet
+from lightkube.resources.core_v1 import Pod
+
+from k8s_compute_resources import K8sComputeResources
+
+RESOURCES = ResourceRequirements(
+    limits={"cpu": "2", "memory": "2Gi"},
+    requests={"cpu": "2", "memory": "2Gi"},
+)
+
+
+def _statefulset(resources: ResourceRequirements) -> StatefulSet:
+    return StatefulSet(
+        spec=StatefulSetSpec(
+            selector=LabelSelector(),
+            serviceName="amf",
+            template=PodTemplateSpec(
+                spec=PodSpec(
+                    containers=[
+                        Container(name="charm"),
+                        Container(name="amf", resources=resources),
+                    ]
+                )
+            ),
+        )
+    )
+
+
+class TestK8sComputeResources:
+    patcher_client = patch("k8s_compute_resources.Client")
+
+    @pytest.fixture(autouse=True)
+    def setup(self, request):
+        self.mock_client_class = TestK8sComputeResources.patcher_client.start()
+        self.mock_client = self.mock_client_class.return_value
+        self.k8s_compute_resources = K8sComputeResources(
+            namespace="whatever",
+            statefulset_name="amf",
+            pod_name="amf-0",
+            container_name="amf",
+            field_manager="amf",
+            managed_resources=["cpu", "memory", "hugepages-2Mi"],
+        )
+        yield
+        request.addfinalizer(self.teardown)
+
+    @staticmethod
+    def teardown() -> None:
+        patch.stopall()
+
+    def test_given_statefulset_has_equivalent_quantities_when_statefulset_is_patched_then_returns_true(  # noqa: E501
+        self,
+    ):
+        self.mock_client.get.return_value = _statefulset(
+            ResourceRequirements(
+                limits={"cpu": "2000m", "memory": "2048Mi"},
+                requests={"cpu": "2", "memory": "2Gi"},
+            )
+        )
+
+        assert self.k8s_compute_resources.statefulset_is_patched(RESOURCES)
+
+    def test_given_statefulset_has_other_resources_when_statefulset_is_patched_then_returns_false(  # noqa: E501
+        self,
+    ):
+        self.mock_client.get.return_value = _statefulset(
+            ResourceRequirements(limits={"cpu": "1"})
+        )
+
+        assert not self.k8s_compute_resources.statefulset_is_patched(RESOURCES)
+
+    def test_given_pod_requests_defaulted_to_limits_when_pod_is_patched_then_returns_true(
+        self,
+    ):
+        self.mock_client.get.return_value = Pod(
+            spec=PodSpec(
+                containers=[
+                    Container(
+                        name="amf",
+                        resources=ResourceRequirements(
+                            limits={"cpu": "2"}, requests={"cpu": "2"}
+                        ),
+                    )
+                ]
+            )
+        )
+
+        assert self.k8s_compute_resources.pod_is_patched(
+            ResourceRequirements(limits={"cpu": "2"}, requests={})
+        )
+
+    def test_given_statefulset_has_unmanaged_resources_when_statefulset_is_patched_then_they_are_ignored(  # noqa: E501
+        self,
+    ):
+        self.mock_client.get.return_value = _statefulset(
+            ResourceRequirements(
+                limits={"cpu": "2", "memory": "2Gi", "ephemeral-storage": "1Gi"},
+                requests={"cpu": "2", "memory": "2Gi"},
+            )
+        )
+
+        assert self.k8s_compute_resources.statefulset_is_patched(RESOURCES)
+
+    def test_given_resources_when_patch_then_workload_container_resources_are_patched(self):
+        self.k8s_compute_resources.patch(ResourceRequirements(limits={"cpu": "2"}, requests={}))
+
+        self.mock_client.patch.assert_called_once_with(
+            StatefulSet,
+            name="amf",
+            namespace="whatever",
+            obj={
+                "spec": {
+                    "template": {
+                        "spec": {
+                            "containers": [
+                                {
+                                    "name": "amf",
+                                    "resources": {
+                                        "limits": {
+                                            "cpu": "2",
+                                            "memory": None,
+                                            "hugepages-2Mi": None,
+                                        },
+                                        "requests": {
+                                            "cpu": None,
+                                            "memory": None,
+                                            "hugepages-2Mi": None,
+                                        },
+                                    },
+                                }
+                            ]
+                        }
+                    }
+                }
+            },
+            field_manager="amf",
+        )
@@ -0,0 +1,107 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import patch
+
+import pytest
+from lightkube.core.exceptions import ApiError
+from lightkube.models.core_v1 import (
+    LoadBalancerIngress,
+    LoadBalancerStatus,
+    ServiceStatus,
+)
+from lightkube.models.meta_v1 import ObjectMeta, Status
+from lightkube.resources.core_v1 import Pod, Service
+
+from k8s_service import K8sService
+
+
+class TestK8sService:
+    patcher_client = patch("k8s_service.Client")
+
+    @pytest.fixture(autouse=True)
+    def setup(self, request):
+        self.mock_client_class = TestK8sService.patcher_client.start()
+        self.mock_client = self.mock_client_class.return_value
+        self.k8s_service = K8sService(
+            namespace="whatever",
+            service_name="amf-external",
+            service_port=38412,
+            app_name="amf",
+            unit_id="0",
+        )
+        yield
+        request.addfinalizer(self.teardown)
+
+    @staticmethod
+    def teardown() -> None:
+        patch.stopall()
+
+    def test_given_kubernetes_api_not_used_when_init_then_client_is_not_created(self):
+        self.mock_client_class.assert_not_called()
+
+    def test_given_service_has_ingress_when_getters_called_then_service_is_fetched_once(self):
+        self.mock_client.get.return_value = Service(
+            status=ServiceStatus(
+                loadBalancer=LoadBalancerStatus(
+                    ingress=[LoadBalancerIngress(ip="192.0.2.1", hostname="amf.example.com")]
+                )
+            )
+        )
+
+        assert self.k8s_service.is_created()
+        assert self.k8s_service.get_ip() == "192.0.2.1"
+        assert self.k8s_service.get_hostname() == "amf.example.com"
+        self.mock_client.get.assert_called_once()
+        self.mock_client_class.assert_called_once()
+
+    def test_given_service_fetched_when_create_then_service_is_fetched_again(self):
+        self.mock_client.get.return_value = Service(status=ServiceStatus())
+        self.k8s_service.get_ip()
+
+        self.k8s_service.create()
+        self.k8s_service.get_ip()
+
+        assert self.mock_client.get.call_count == 2
+
+    def test_when_create_then_service_selects_active_pod_only(self):
+        self.k8s_service.create()
+
+        service = self.mock_client.apply.call_args.args[0]
+        assert service.spec.selector == {
+            "app.kubernetes.io/name": "amf",
+            "sdcore.canonical.com/amf-active": "true",
+        }
+
+    def test_given_other_pod_is_active_when_set_active_pod_then_labels_are_moved_to_this_pod(
+        self,
+    ):
+        self.mock_client.list.return_value = [Pod(metadata=ObjectMeta(name="amf-1"))]
+
+        self.k8s_service.set_active_pod()
+
+        assert self.mock_client.patch.call_args_list[0].kwargs == {
+            "name": "amf-1",
+            "namespace": "whatever",
+            "obj": {"metadata": {"labels": {"sdcore.canonical.com/amf-active": None}}},
+        }
+        assert self.mock_client.patch.call_args_list[1].kwargs == {
+            "name": "amf-0",
+            "namespace": "whatever",
+            "obj": {"metadata": {"labels": {"sdcore.canonical.com/amf-active": "true"}}},
+        }
+
+    def test_given_this_pod_is_already_active_when_set_active_pod_then_pod_is_not_patched(
+        self,
+    ):
+        self.mock_client.list.return_value = [Pod(metadata=ObjectMeta(name="amf-0"))]
+
+        self.k8s_service.set_active_pod()
+
+        self.mock_client.patch.assert_not_called()
+
+    def test_given_pod_not_found_when_set_active_pod_then_error_is_not_raised(self):
+        self.mock_client.list.return_value = []
+        self.mock_client.patch.side_effect = ApiError(status=Status(code=404, message="not found"))
+
+        self.k8s_service.set_active_pod()
@@ -0,0 +1,76 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import patch
+
+import pytest
+from lightkube.models.core_v1 import (
+    LoadBalancerIngress,
+    LoadBalancerStatus,
+    ServiceStatus,
+)
+from lightkube.resources.core_v1 import Service
+from ops import pebble
+
+from load_balancer_watcher import main
+
+
+def _service(ip=None, hostname=None) -> Service:
+    ingress = [LoadBalancerIngress(ip=ip, hostname=hostname)] if ip or hostname else None
+    return Service(status=ServiceStatus(loadBalancer=LoadBalancerStatus(ingress=ingress)))
+
+
+class TestLoadBalancerWatcher:
+    patcher_client = patch("load_balancer_watcher.Client")
+    patcher_pebble_client = patch("load_balancer_watcher.pebble.Client")
+    patcher_alarm = patch("load_balancer_watcher.signal.alarm")
+
+    @pytest.fixture(autouse=True)
+    def setup(self, request):
+        self.mock_client = TestLoadBalancerWatcher.patcher_client.start().return_value
+        self.mock_pebble_client = TestLoadBalancerWatcher.patcher_pebble_client.start()
+        self.mock_alarm = TestLoadBalancerWatcher.patcher_alarm.start()
+        yield
+        request.addfinalizer(self.teardown)
+
+    @staticmethod
+    def teardown() -> None:
+        patch.stopall()
+
+    def test_given_address_assigned_after_a_while_when_main_then_custom_notice_is_recorded(self):
+        self.mock_client.watch.return_value = iter(
+            [("ADDED", _service()), ("MODIFIED", _service(ip="192.0.2.1"))]
+        )
+
+        main(
+            [
+                "--namespace", "whatever",
+                "--service-name", "amf-external",
+                "--pebble-socket", "/charm/containers/amf/pebble.socket",
+                "--notice-key", "canonical.com/sdcore-amf-k8s/load-balancer-address",
+                "--timeout", "600",
+            ]
+        )
+
+        self.mock_alarm.assert_called_once_with(600)
+        self.mock_pebble_client.assert_called_once_with(
+            socket_path="/charm/containers/amf/pebble.socket"
+        )
+        self.mock_pebble_client.return_value.notify.assert_called_once_with(
+            pebble.NoticeType.CUSTOM, "canonical.com/sdcore-amf-k8s/load-balancer-address"
+        )
+
+    def test_given_address_never_assigned_when_main_then_custom_notice_is_not_recorded(self):
+        self.mock_client.watch.return_value = iter([("ADDED", _service())])
+
+        main(
+            [
+                "--namespace", "whatever",
+                "--service-name", "amf-external",
+                "--pebble-socket", "/charm/containers/amf/pebble.socket",
+                "--notice-key", "canonical.com/sdcore-amf-k8s/load-balancer-address",
+                "--timeout", "600",
+            ]
+        )
+
+        self.mock_pebble_client.return_value.notify.assert_not_called()
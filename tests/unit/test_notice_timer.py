@@ -0,0 +1,42 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import patch
+
+import pytest
+from ops import pebble
+
+from notice_timer import main
+
+
+class TestNoticeTimer:
+    patcher_pebble_client = patch("notice_timer.pebble.Client")
+    patcher_sleep = patch("notice_timer.time.sleep")
+
+    @pytest.fixture(autouse=True)
+    def setup(self, request):
+        self.mock_pebble_client = TestNoticeTimer.patcher_pebble_client.start()
+        self.mock_sleep = TestNoticeTimer.patcher_sleep.start()
+        yield
+        request.addfinalizer(self.teardown)
+
+    @staticmethod
+    def teardown() -> None:
+        patch.stopall()
+
+    def test_given_delay_when_main_then_custom_notice_is_recorded_after_the_delay(self):
+        main(
+            [
+                "--pebble-socket", "/charm/containers/amf/pebble.socket",
+                "--notice-key", "canonical.com/sdcore-amf-k8s/restart",
+                "--delay", "25",
+            ]
+        )
+
+        self.mock_sleep.assert_called_once_with(25)
+        self.mock_pebble_client.assert_called_once_with(
+            socket_path="/charm/containers/amf/pebble.socket"
+        )
+        self.mock_pebble_client.return_value.notify.assert_called_once_with(
+            pebble.NoticeType.CUSTOM, "canonical.com/sdcore-amf-k8s/restart"
+        )